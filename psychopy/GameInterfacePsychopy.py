@@ -34,32 +34,34 @@ from psychopy.hardware import keyboard
 
 #########################
 
-import scipy
 import numpy as np
-import matplotlib.pyplot as plt
 import time
-import mne
-from scipy.signal import butter, lfilter
 
 import brainflow
 from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
 
 
-# Import the custom module.
+# Import the custom modules. data_process only imports MNE, SciPy and matplotlib when process_eeg_beta first runs.
 from brainflow_stream import BrainFlowBoardSetup
+from data_process import process_eeg_beta
+from acquisition_daemon import DaemonBoard
 board_id = BoardIds.CYTON_BOARD.value # Set the board_id to match the Cyton board
 
  # Lets quickly take a look at the specifications of the Cyton board
 for item1, item2 in BoardShim.get_board_descr(board_id).items():
     print(f"{item1}: {item2}")
  ##########################
-cyton_board = BrainFlowBoardSetup(
-                                board_id = board_id,
-                                name = 'Board_1', # Optional name for the board. This is useful if you have multiple boards connected and want to distinguish between them.
-                                serial_port = None # If the serial port is not specified, it will try to auto-detect the board. If this fails, you will have to assign the correct serial port. See https://docs.openbci.com/GettingStarted/Boards/CytonGS/ 
-                                ) 
+# If an acquisition daemon is running (python acquisition_daemon.py), reuse its already streaming board instead of
+# bringing the board up for this run. Otherwise connect to the board directly.
+cyton_board = DaemonBoard.try_attach(name = 'Board_1')
+if cyton_board is None:
+    cyton_board = BrainFlowBoardSetup(
+                                    board_id = board_id,
+                                    name = 'Board_1', # Optional name for the board. This is useful if you have multiple boards connected and want to distinguish between them.
+                                    serial_port = None # If the serial port is not specified, it will try to auto-detect the board. If this fails, you will have to assign the correct serial port. See https://docs.openbci.com/GettingStarted/Boards/CytonGS/ 
+                                    ) 
 
-cyton_board.setup() # This will establish a connection to the board and start streaming data.
+    cyton_board.setup() # This will establish a connection to the board and start streaming data.
 
 # DM01HOSQA
 ################################
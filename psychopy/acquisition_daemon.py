@@ -0,0 +1,483 @@
+import argparse
+import itertools
+import json
+import os
+import secrets
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from brainflow.board_shim import BoardShim, BoardIds
+
+from brainflow_stream import BrainFlowBoardSetup, _as_row_slice
+from shared_stream import SharedMemoryPublisher, SharedMemoryReader
+
+
+# Local address of the daemon's control connection (clients on the same machine only), and the file holding the
+# random key clients must present, readable by the current user only
+DAEMON_ADDRESS = ('127.0.0.1', 57300)
+DAEMON_KEY_FILE = os.path.join(os.path.expanduser('~'), '.brainflow_daemon_key')
+
+
+def _send_message(conn, message):
+    """
+    Sends a dictionary over a control connection as JSON (never pickled, so a peer cannot run code in this process).
+    """
+    def to_builtin(value):
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        raise TypeError(f"Cannot send {type(value).__name__} to the acquisition daemon.")
+
+    conn.send_bytes(json.dumps(message, default=to_builtin).encode('utf-8'))
+
+
+def _recv_message(conn):
+    """
+    Receives a dictionary sent by _send_message().
+
+    Raises:
+        ValueError: If the message is not a JSON object.
+    """
+    message = json.loads(conn.recv_bytes().decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("Acquisition daemon messages must be JSON objects.")
+    return message
+
+
+def write_daemon_key(key_file=DAEMON_KEY_FILE):
+    """
+    Generates a random daemon key and stores it, hex encoded, in a file only the current user can read.
+
+    Args:
+        key_file (str, optional): Path of the key file. Default is DAEMON_KEY_FILE.
+
+    Returns:
+        bytes: The key.
+    """
+    key = secrets.token_bytes(32)
+    if os.path.exists(key_file):
+        os.remove(key_file)
+    # Created with owner-only permissions, so the key is never readable by other users, even briefly
+    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(key.hex())
+    return key
+
+
+def read_daemon_key(key_file=DAEMON_KEY_FILE):
+    """
+    Reads the key written by the running daemon.
+
+    Args:
+        key_file (str, optional): Path of the key file. Default is DAEMON_KEY_FILE.
+
+    Returns:
+        bytes: The key.
+
+    Raises:
+        FileNotFoundError: If no daemon wrote a key file.
+    """
+    with open(key_file) as f:
+        return bytes.fromhex(f.read().strip())
+
+
+class AcquisitionDaemon:
+    """
+    A long-lived local process that keeps a board session prepared and streaming between experiment runs.
+
+    The board is set up once, in background mode, and its stream is mirrored into shared memory. Experiment scripts
+    attach with DaemonBoard, read the shared stream and insert markers through a small control connection, and detach
+    when they finish; the board keeps streaming, so no run pays board bring-up (or Cyton resets) again.
+
+    Control messages are JSON, and clients authenticate with a random key that the daemon writes to key_file, readable
+    by the current user only.
+
+    Attributes:
+        board (BrainFlowBoardSetup): The board kept streaming.
+        publisher (SharedMemoryPublisher): Mirrors the board stream into shared memory for the clients.
+        address (tuple | str): Address of the control connection.
+        key_file (str): File holding the random key of the control connection while the daemon serves.
+        clients (dict): Attached clients keyed by client ID, with their 'name' and 'attach_time'.
+    """
+
+    def __init__(self, board, address=DAEMON_ADDRESS, key_file=DAEMON_KEY_FILE, history_seconds=60):
+        """
+        Initializes the daemon. The board is set up by serve_forever().
+
+        Args:
+            board (BrainFlowBoardSetup): The board to keep streaming.
+            address (tuple | str, optional): (host, port) or Unix socket path of the control connection. Default is DAEMON_ADDRESS.
+            key_file (str, optional): File receiving the random key clients must present (readable by the current
+                user only). Default is DAEMON_KEY_FILE.
+            history_seconds (float, optional): Seconds of history kept in the board buffer and in shared memory. Default is 60.
+        """
+        self.board = board
+        self.address = address
+        self.key_file = key_file
+        self.authkey = None
+        self.history_seconds = history_seconds
+        self.publisher = None
+        self.clients = {}
+        self._client_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._shutdown = threading.Event()
+
+    def start(self, **setup_kwargs):
+        """
+        Sets up the board in background mode and starts publishing its stream.
+
+        Args:
+            **setup_kwargs: Additional keyword arguments passed to the board's setup() (e.g. stall_timeout, fill_gaps).
+
+        Returns:
+            bool: True if the board is streaming, False otherwise.
+        """
+        if not self.board.background:
+            self.board.setup(background=True, history_seconds=self.history_seconds, **setup_kwargs)
+        if not self.board.background:
+            print(f"[{self.board.name}] Board did not start streaming, the daemon cannot start.")
+            return False
+        self.publisher = SharedMemoryPublisher(self.board, history_seconds=self.history_seconds)
+        self.publisher.start()
+        return True
+
+    def serve_forever(self, **setup_kwargs):
+        """
+        Starts the board, then accepts client connections until shutdown() is called (or a client requests it).
+
+        Args:
+            **setup_kwargs: Additional keyword arguments passed to the board's setup().
+        """
+        if self.publisher is None and not self.start(**setup_kwargs):
+            return
+        self.authkey = write_daemon_key(self.key_file)
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"[{self.board.name}] Acquisition daemon listening on {self.address}.")
+            while not self._shutdown.is_set():
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as e:
+                    print(f"[{self.board.name}] Rejected a client connection: {e}")
+                    continue
+                if self._shutdown.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_client, args=(conn,), name=f"{self.board.name} daemon client", daemon=True).start()
+        self.stop()
+
+    def shutdown(self):
+        """
+        Stops accepting clients and makes serve_forever() stop the board and return.
+        """
+        self._shutdown.set()
+        try:
+            Client(self.address, authkey=self.authkey).close()  # wake up the blocking accept()
+        except (OSError, EOFError, AuthenticationError):
+            pass
+
+    def stop(self):
+        """
+        Stops publishing and releases the board session.
+        """
+        if self.publisher is not None:
+            self.publisher.stop()
+            self.publisher = None
+        if self.authkey is not None:
+            self.authkey = None
+            if os.path.exists(self.key_file):
+                os.remove(self.key_file)
+        self.board.stop()
+
+    def _serve_client(self, conn):
+        """
+        Answers the requests of one client connection until it detaches or disconnects.
+        """
+        client_id = None
+        with conn:
+            while True:
+                try:
+                    request = _recv_message(conn)
+                except (EOFError, OSError):
+                    break
+                except ValueError as e:
+                    _send_message(conn, {'ok': False, 'error': f"Malformed request: {e}"})
+                    continue
+                command = request.get('command')
+                try:
+                    if command == 'attach':
+                        client_id = next(self._client_ids)
+                        with self._lock:
+                            self.clients[client_id] = {'name': request.get('name'), 'attach_time': time.time()}
+                        print(f"[{self.board.name}] Client {request.get('name') or client_id} attached.")
+                        reply = self._stream_info()
+                    elif command == 'insert_marker':
+                        self.board.insert_marker(request['value'], verbose=False, queued=True)
+                        reply = {}
+                    elif command == 'status':
+                        reply = self._status()
+                    elif command == 'detach':
+                        _send_message(conn, {'ok': True})
+                        break
+                    elif command == 'shutdown':
+                        _send_message(conn, {'ok': True})
+                        self.shutdown()
+                        break
+                    else:
+                        raise ValueError(f"Unknown command '{command}'.")
+                    _send_message(conn, dict(reply, ok=True))
+                except Exception as e:
+                    _send_message(conn, {'ok': False, 'error': str(e)})
+
+        if client_id is not None:
+            with self._lock:
+                client = self.clients.pop(client_id, {})
+            print(f"[{self.board.name}] Client {client.get('name') or client_id} detached.")
+
+    def _stream_info(self):
+        """
+        Returns what a client needs to read the shared stream like a BrainFlowBoardSetup.
+        """
+        return {
+            'shm_name': self.publisher.name,
+            'board_id': self.board.board_id,
+            'master_board': self.board.master_board,
+            'board_name': self.board.name,
+            'sampling_rate': self.board.sampling_rate,
+            'eeg_channels': list(self.board.eeg_channels),
+            'channel_rows': self.board.channel_rows,
+            'channel_names': self.board.channel_names,
+            # Set when the shared stream holds float32 samples: its timestamp row holds seconds since this time
+            'timestamp_origin': self.publisher.converter.timestamp_origin,
+        }
+
+    def _status(self):
+        """
+        Returns the stream health, packet loss and attached clients of the daemon.
+        """
+        with self._lock:
+            clients = [dict(client) for client in self.clients.values()]
+        return {
+            'streaming': self.board.is_streaming() and self.board.background,
+            'latest_sample_index': self.board.latest_sample_index,
+            'health': self.board.get_stream_health(),
+            'packet_loss': self.board.get_packet_loss_stats(),
+            'timestamp_origin': self.publisher.converter.timestamp_origin if self.publisher is not None else None,
+            'clients': clients,
+        }
+
+
+class DaemonBoard:
+    """
+    A client of an AcquisitionDaemon that stands in for a BrainFlowBoardSetup in experiment scripts.
+
+    It offers the parts of the BrainFlowBoardSetup API used by the game and process_eeg_beta (get_current_board_data,
+    get_board_data, insert_marker, eeg_channels, sampling_rate, stop), reading the daemon's shared stream directly.
+    stop() only detaches: the board keeps streaming for the next run.
+
+    Attributes:
+        name (str): Name of this client, reported to the daemon.
+        board_id (int): BrainFlow board ID of the daemon's board.
+        sampling_rate (int): Sampling rate of the board.
+        eeg_channels (list): EEG rows of the board data.
+        channel_rows (list): Rows of the board data held by the shared stream (None if every row is).
+        timestamp_origin (float): Time subtracted from the timestamp row of a float32 stream (None for absolute times).
+        reader (SharedMemoryReader): Reader of the daemon's shared stream.
+    """
+
+    def __init__(self, address=DAEMON_ADDRESS, key_file=DAEMON_KEY_FILE, name=None):
+        """
+        Connects to a running daemon and attaches to its stream.
+
+        Args:
+            address (tuple | str, optional): Address of the daemon's control connection. Default is DAEMON_ADDRESS.
+            key_file (str, optional): Key file written by the daemon. Default is DAEMON_KEY_FILE.
+            name (str, optional): Name of this client, used in the daemon's messages.
+
+        Raises:
+            FileNotFoundError: If no daemon wrote a key file.
+            ConnectionRefusedError: If no daemon is listening on the address.
+            multiprocessing.AuthenticationError: If the service on the address does not know the daemon key.
+        """
+        self._conn = Client(address, authkey=read_daemon_key(key_file))
+        self._lock = threading.Lock()
+        info = self._request('attach', name=name)
+        self.name = name or info['board_name']
+        self.board_id = info['board_id']
+        self.master_board = info['master_board']
+        self.sampling_rate = info['sampling_rate']
+        self.eeg_channels = info['eeg_channels']
+        self.channel_rows = info['channel_rows']
+        self.channel_names = info['channel_names']
+        self._row_positions = {row: i for i, row in enumerate(self.channel_rows or [])}
+        self._num_board_rows = BoardShim.get_num_rows(self.master_board if self.master_board is not None else self.board_id)
+        self._timestamp_origin = info['timestamp_origin']
+        self.reader = SharedMemoryReader(info['shm_name'])
+        self._read_index = self.reader.latest_sample_index
+        self.streaming = True
+
+    @classmethod
+    def try_attach(cls, address=DAEMON_ADDRESS, key_file=DAEMON_KEY_FILE, name=None):
+        """
+        Attaches to a running daemon if there is one.
+
+        Returns:
+            DaemonBoard: The attached client, or None if no daemon is running (or another service holds its address).
+        """
+        try:
+            return cls(address, key_file, name)
+        except (OSError, EOFError, AuthenticationError):
+            return None
+
+    def _request(self, command, **kwargs):
+        """
+        Sends a request to the daemon and returns its reply.
+
+        Raises:
+            RuntimeError: If the daemon could not carry out the request.
+        """
+        with self._lock:
+            _send_message(self._conn, dict(kwargs, command=command))
+            reply = _recv_message(self._conn)
+        if not reply.pop('ok'):
+            raise RuntimeError(f"Acquisition daemon could not {command}: {reply['error']}")
+        return reply
+
+    def _stored_rows(self, channels):
+        """
+        Translates board data rows into rows of the shared stream, which only holds channel_rows when the daemon's
+        board declared a channel selection.
+
+        Args:
+            channels (slice | list | int | None): Board data rows. None selects every row of the stream.
+
+        Returns:
+            slice | list | int: The equivalent selection of stream rows.
+
+        Raises:
+            ValueError: If a requested row is not part of the channel selection.
+        """
+        if self.channel_rows is None or channels is None:
+            return _as_row_slice(channels)
+        if isinstance(channels, slice):
+            channels = range(*channels.indices(self._num_board_rows))
+        single = isinstance(channels, (int, np.integer))
+        rows = [channels] if single else channels
+        missing = [row for row in rows if row not in self._row_positions]
+        if missing:
+            raise ValueError(f"[{self.name}] Rows {missing} are not part of the channel selection {self.channel_rows}.")
+        positions = [self._row_positions[row] for row in rows]
+        return positions[0] if single else _as_row_slice(positions)
+
+    @property
+    def timestamp_origin(self):
+        """
+        float: Time subtracted from the timestamp row of a float32 stream, None if its timestamps are absolute. Asked
+        again from the daemon until its first float32 chunk has fixed it.
+        """
+        if self._timestamp_origin is None and self.reader.buffer.data.dtype != np.float64:
+            self._timestamp_origin = self._request('status').get('timestamp_origin')
+        return self._timestamp_origin
+
+    def get_current_board_data(self, num_samples, channels=None):
+        """
+        Retrieves the most recent num_samples samples of the shared stream.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch.
+            channels (slice | list | int, optional): Rows of the board data to return. Defaults to every row of the stream.
+
+        Returns:
+            numpy.ndarray: The (rows x samples) window.
+        """
+        return self.reader.get_current_board_data(int(num_samples), channels=self._stored_rows(channels))
+
+    def get_board_data(self):
+        """
+        Retrieves the samples published since the previous call (or since attaching), clipped to the history still
+        held by the shared stream.
+
+        Returns:
+            numpy.ndarray: The (rows x samples) data.
+        """
+        # Continue from the stop index of this read rather than counting the samples returned, which the clipping to
+        # the oldest held sample would make fall behind
+        stop_index = self.reader.latest_sample_index
+        data = self.reader.buffer.read_consistent(self._read_index, stop_index)
+        self._read_index = stop_index
+        return data
+
+    def insert_marker(self, marker, verbose=True):
+        """
+        Asks the daemon to insert a marker into the stream (queued and inserted by its acquisition thread).
+
+        Args:
+            marker (float): The marker value to be inserted.
+            verbose (bool): Whether to print a confirmation message. Default is True.
+        """
+        self._request('insert_marker', value=float(marker))
+        if verbose:
+            print(f"[{self.name}] Marker {marker} sent to the acquisition daemon.")
+
+    def get_status(self):
+        """
+        Retrieves the daemon's stream health, packet loss statistics and attached clients.
+
+        Returns:
+            dict: 'streaming', 'latest_sample_index', 'health', 'packet_loss', 'timestamp_origin' and 'clients'.
+        """
+        return self._request('status')
+
+    def get_sampling_rate(self):
+        return self.sampling_rate
+
+    def is_streaming(self):
+        return self.streaming
+
+    def get_board_name(self):
+        return self.name
+
+    def stop(self):
+        """
+        Detaches from the daemon. The board keeps streaming for the next client.
+        """
+        if not self.streaming:
+            return
+        self.streaming = False
+        try:
+            self._request('detach')
+        except (EOFError, OSError, ValueError):
+            pass
+        self._conn.close()
+        self.reader.close()
+        print(f"[{self.name}] Detached from the acquisition daemon.")
+
+    def __del__(self):
+        if self.__dict__.get('streaming'):
+            self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep a BrainFlow board streaming between experiment runs.")
+    parser.add_argument('--board-id', type=int, default=BoardIds.CYTON_BOARD.value, help="BrainFlow board ID.")
+    parser.add_argument('--serial-port', default=None, help="Serial port of the dongle (auto-detected if omitted).")
+    parser.add_argument('--channels', default=None, help="Channel selection kept in the stream, e.g. 'eeg+marker'.")
+    parser.add_argument('--float32', action='store_true', help="Keep and share samples as float32 instead of float64.")
+    parser.add_argument('--history', type=float, default=60, help="Seconds of history kept in shared memory.")
+    parser.add_argument('--stall-timeout', type=float, default=5.0, help="Seconds without data before the board is reconnected.")
+    parser.add_argument('--port', type=int, default=DAEMON_ADDRESS[1], help="Local TCP port of the control connection.")
+    parser.add_argument('--key-file', default=DAEMON_KEY_FILE, help="File receiving the key clients must present.")
+    args = parser.parse_args()
+
+    BoardShim.disable_board_logger()
+    board = BrainFlowBoardSetup(board_id=args.board_id, serial_port=args.serial_port, name='Daemon board', channels=args.channels,
+                                dtype=np.float32 if args.float32 else np.float64)
+    daemon = AcquisitionDaemon(board, address=(DAEMON_ADDRESS[0], args.port), key_file=args.key_file, history_seconds=args.history)
+    try:
+        daemon.serve_forever(stall_timeout=args.stall_timeout)
+    except KeyboardInterrupt:
+        daemon.stop()
@@ -0,0 +1,149 @@
+import argparse
+import time
+
+import numpy as np
+import mne
+
+from benchmark_float32 import synthetic_eeg, time_per_call
+from data_process import EEG_BANDS, IncrementalWelch, MultiBandExtractor, compute_beta_power_db, convert_to_mne, extract_beta_power, remove_dc_offset, welch_psd
+
+
+def mne_beta_power(window, sampling_rate):
+    """
+    The original per-window path: MNE RawArray construction, psd_array_welch and a second RawArray for the dB result.
+    """
+    return extract_beta_power(convert_to_mne(window, sampling_rate)).get_data()
+
+
+def numpy_beta_power(window, sampling_rate):
+    """
+    The pure-NumPy path used by process_eeg_beta.
+    """
+    return compute_beta_power_db(window, sampling_rate)[0]
+
+
+def run_benchmark(num_channels=8, sampling_rate=250, window_seconds=(3, 6), repeat=200):
+    """
+    Measures the per-window latency of each beta power path and its largest difference from the MNE path.
+
+    Args:
+        num_channels (int): Number of EEG channels. Default is 8 (Cyton).
+        sampling_rate (int): Sampling rate in Hz. Default is 250.
+        window_seconds (tuple): Window lengths to test, in seconds. Default is (3, 6), the periods used by the game.
+        repeat (int): Repetitions per timing. Default is 200.
+
+    Returns:
+        list: One dictionary per (window, path) with 'window_seconds', 'path', 'latency_ms' and 'max_diff_db'.
+    """
+    paths = {'mne': mne_beta_power, 'numpy': numpy_beta_power}
+    results = []
+    for seconds in window_seconds:
+        window = remove_dc_offset(synthetic_eeg(num_channels, int(seconds * sampling_rate), sampling_rate), rows=None)
+        reference = mne_beta_power(window, sampling_rate)
+        for name, path in paths.items():
+            results.append({
+                'window_seconds': seconds,
+                'path': name,
+                'latency_ms': 1000 * time_per_call(lambda: path(window, sampling_rate), repeat),
+                'max_diff_db': float(np.max(np.abs(path(window, sampling_rate) - reference))),
+            })
+    return results
+
+
+def run_multiband_benchmark(num_channels=8, sampling_rate=250, window_seconds=4, bands=EEG_BANDS, repeat=200):
+    """
+    Compares one Welch spectrum per band (masking the bins of each) with MultiBandExtractor's single pass.
+
+    Args:
+        num_channels (int): Number of EEG channels. Default is 8.
+        sampling_rate (int): Sampling rate in Hz. Default is 250.
+        window_seconds (float): Window length in seconds. Default is 4.
+        bands (dict): Bands to extract. Default is EEG_BANDS.
+        repeat (int): Repetitions per timing. Default is 200.
+
+    Returns:
+        dict: 'per_band_ms', 'single_pass_ms' and 'max_relative_diff' between the two.
+    """
+    window = remove_dc_offset(synthetic_eeg(num_channels, int(window_seconds * sampling_rate), sampling_rate), rows=None)
+    extractor = MultiBandExtractor(sampling_rate, bands)
+
+    def per_band():
+        powers = []
+        for low, high in bands.values():
+            psd, freqs = welch_psd(window, sampling_rate, fmin=low, fmax=high, n_fft=512)
+            powers.append(psd[:, freqs < high].sum(axis=-1) * sampling_rate / 512)
+        return np.stack(powers, axis=-1)
+
+    reference = per_band()
+    return {
+        'per_band_ms': 1000 * time_per_call(per_band, repeat),
+        'single_pass_ms': 1000 * time_per_call(lambda: extractor.compute(window), repeat),
+        'max_relative_diff': float(np.max(np.abs(extractor.compute(window) - reference) / reference)),
+    }
+
+
+def run_incremental_benchmark(num_channels=8, sampling_rate=250, window_seconds=4, hop_samples=64, n_fft=256, num_hops=500):
+    """
+    Compares recomputing Welch over the whole window at every hop with IncrementalWelch, which only transforms the
+    segments completed by the new samples.
+
+    Args:
+        num_channels (int): Number of EEG channels. Default is 8.
+        sampling_rate (int): Sampling rate in Hz. Default is 250.
+        window_seconds (float): Length of the averaged window in seconds. Default is 4.
+        hop_samples (int): New samples per update, which is also the segment step. Default is 64 (256 ms at 250 Hz).
+        n_fft (int): Segment length in samples. Default is 256.
+        num_hops (int): Number of updates timed. Default is 500.
+
+    Returns:
+        dict: 'recompute_ms' and 'incremental_ms' per hop, and the 'max_relative_diff' of the final estimates.
+    """
+    window_samples = int(window_seconds * sampling_rate)
+    stream = synthetic_eeg(num_channels, window_samples + num_hops * hop_samples, sampling_rate)
+    n_overlap = n_fft - hop_samples
+    incremental = IncrementalWelch(sampling_rate, window_seconds, n_fft=n_fft, n_overlap=n_overlap)
+    # Whole segments only, so the recomputed window and the incremental one cover the same segments
+    window_samples = n_fft + (incremental.num_segments - 1) * hop_samples
+    incremental.update(stream[:, :window_samples])
+
+    recompute_seconds = incremental_seconds = 0.0
+    for hop in range(num_hops):
+        stop = window_samples + (hop + 1) * hop_samples
+        start = time.perf_counter()
+        recomputed, _ = welch_psd(stream[:, stop - window_samples:stop], sampling_rate, n_fft=n_fft, n_overlap=n_overlap)
+        recompute_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental.update(stream[:, stop - hop_samples:stop])
+        estimate, _ = incremental.get_psd()
+        incremental_seconds += time.perf_counter() - start
+
+    return {
+        'recompute_ms': 1000 * recompute_seconds / num_hops,
+        'incremental_ms': 1000 * incremental_seconds / num_hops,
+        'max_relative_diff': float(np.max(np.abs(estimate - recomputed)) / np.max(recomputed)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-window latency of the beta band power paths.")
+    parser.add_argument('--channels', type=int, default=8, help="Number of EEG channels.")
+    parser.add_argument('--windows', type=float, nargs='+', default=[3, 6], help="Window lengths in seconds (at least 512 samples).")
+    parser.add_argument('--repeat', type=int, default=200, help="Repetitions per timing.")
+    args = parser.parse_args()
+
+    mne.set_log_level('WARNING')
+    results = run_benchmark(args.channels, window_seconds=args.windows, repeat=args.repeat)
+
+    print(f"{'window s':>8} {'path':>8} {'latency ms':>11} {'max diff dB':>12}")
+    for r in results:
+        print(f"{r['window_seconds']:>8g} {r['path']:>8} {r['latency_ms']:>11.3f} {r['max_diff_db']:>12.2e}")
+
+    multiband = run_multiband_benchmark(args.channels, repeat=args.repeat)
+    print(f"\n{len(EEG_BANDS)} bands: {multiband['per_band_ms']:.3f} ms with one Welch per band, "
+          f"{multiband['single_pass_ms']:.3f} ms in a single pass (max relative difference {multiband['max_relative_diff']:.1e})")
+
+    for channels in (args.channels, 8 * args.channels):
+        sliding = run_incremental_benchmark(channels)
+        print(f"Sliding 4 s window, 256 ms hop, {channels} channels: {sliding['recompute_ms']:.3f} ms per hop recomputed, "
+              f"{sliding['incremental_ms']:.3f} ms incremental (max relative difference {sliding['max_relative_diff']:.1e})")
@@ -0,0 +1,105 @@
+import argparse
+import time
+
+import numpy as np
+import mne
+
+from brainflow_stream import RingBuffer
+from data_process import convert_to_mne, extract_beta_power, remove_dc_offset
+
+
+def synthetic_eeg(num_channels, num_samples, sampling_rate, seed=0):
+    """
+    Generates Cyton-like raw EEG in microvolts: a large per-channel DC offset, alpha and beta rhythms and noise.
+
+    Args:
+        num_channels (int): Number of channels.
+        num_samples (int): Number of samples.
+        sampling_rate (int): Sampling rate in Hz.
+        seed (int): Seed of the random generator. Default is 0.
+
+    Returns:
+        numpy.ndarray: A float64 (channels x samples) array.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(num_samples) / sampling_rate
+    offsets = rng.uniform(-50000, 50000, (num_channels, 1))
+    rhythms = 20 * np.sin(2 * np.pi * 10 * t) + 8 * np.sin(2 * np.pi * rng.uniform(13, 30, (num_channels, 1)) * t)
+    return offsets + rhythms + rng.normal(0, 10, (num_channels, num_samples))
+
+
+def time_per_call(function, repeat):
+    """
+    Returns the median duration of function() in seconds over repeat calls.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations))
+
+
+def run_benchmark(num_channels=16, sampling_rate=250, history_seconds=60, window_seconds=4.0, chunk_size=5, repeat=200):
+    """
+    Compares the float64 and float32 storage paths: ingest throughput into the ring buffer, window read + DC offset
+    removal throughput, buffer memory, and the difference between the beta band powers computed from either path.
+
+    Args:
+        num_channels (int): Rows per sample. Default is 16.
+        sampling_rate (int): Sampling rate in Hz. Default is 250.
+        history_seconds (float): Seconds of history held by the ring buffer. Default is 60.
+        window_seconds (float): Analysis window in seconds (the MNE Welch path needs at least 512 samples). Default is 4.0.
+        chunk_size (int): Samples per ingested chunk (one 20 ms drain at 250 Hz). Default is 5.
+        repeat (int): Repetitions per timing. Default is 200.
+
+    Returns:
+        dict: Results keyed by 'float64' and 'float32' ('ingest_samples_per_s', 'window_ms', 'buffer_mb'), plus
+            'max_band_power_diff_db' between the two paths.
+    """
+    capacity = int(history_seconds * sampling_rate)
+    window_samples = int(window_seconds * sampling_rate)
+    raw = synthetic_eeg(num_channels, capacity, sampling_rate)
+    chunks = [raw[:, i:i + chunk_size] for i in range(0, capacity, chunk_size)]
+
+    results = {}
+    band_powers = {}
+    for dtype in (np.float64, np.float32):
+        buffer = RingBuffer(num_channels, capacity, dtype=dtype)
+
+        def ingest():
+            # Chunks arrive as float64 from BrainFlow; the float32 path pays one conversion per chunk, as in _ingest()
+            for chunk in chunks:
+                buffer.write(chunk if dtype == np.float64 else chunk.astype(dtype))
+
+        ingest_seconds = time_per_call(ingest, max(1, repeat // 50))
+        window_seconds_per_call = time_per_call(lambda: remove_dc_offset(buffer.latest(window_samples), rows=None), repeat)
+
+        window = remove_dc_offset(buffer.latest(window_samples), rows=None)
+        band_powers[dtype] = extract_beta_power(convert_to_mne(window, sampling_rate)).get_data()
+        results[np.dtype(dtype).name] = {
+            'ingest_samples_per_s': capacity / ingest_seconds,
+            'window_ms': 1000 * window_seconds_per_call,
+            'buffer_mb': buffer.data.nbytes / 2**20,
+        }
+    results['max_band_power_diff_db'] = float(np.max(np.abs(band_powers[np.float64] - band_powers[np.float32])))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the float64 and float32 storage paths.")
+    parser.add_argument('--channels', type=int, default=16, help="Rows per sample.")
+    parser.add_argument('--history', type=float, default=60, help="Seconds of history held by the ring buffer.")
+    parser.add_argument('--window', type=float, default=4.0, help="Analysis window in seconds.")
+    parser.add_argument('--tolerance', type=float, default=0.05, help="Maximum accepted band power difference in dB.")
+    args = parser.parse_args()
+
+    mne.set_log_level('WARNING')
+    results = run_benchmark(args.channels, history_seconds=args.history, window_seconds=args.window)
+
+    print(f"{'dtype':>8} {'ingest samples/s':>17} {'window ms':>10} {'buffer MB':>10}")
+    for name in ('float64', 'float32'):
+        r = results[name]
+        print(f"{name:>8} {r['ingest_samples_per_s']:>17.0f} {r['window_ms']:>10.3f} {r['buffer_mb']:>10.2f}")
+    diff = results['max_band_power_diff_db']
+    print(f"\nMax beta band power difference: {diff:.2e} dB ({'within' if diff <= args.tolerance else 'OVER'} {args.tolerance} dB tolerance)")
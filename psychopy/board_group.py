@@ -0,0 +1,189 @@
+import concurrent.futures
+
+import numpy as np
+
+
+
+class BoardGroup:
+    """
+    A group of BrainFlow boards that are started, drained and stopped together, with their samples aligned
+    onto a common timeline using the BrainFlow timestamp channel.
+
+    Every board runs its own background acquisition thread. Merged windows use the reference board's timestamps
+    as the timeline; for every board the sample closest in time to each reference timestamp is picked, and
+    timestamps without a sample within max_offset seconds are filled with NaN.
+
+    Attributes:
+        boards (list): The BrainFlowBoardSetup instances in the group.
+        reference (int): Index of the board whose timestamps define the common timeline.
+        channels (list): For each board, the rows of its board data included in merged windows (by default the EEG
+            channels, restricted to the board's channel selection if it declared one).
+        channel_labels (list): (board name, board row) pairs describing each row of a merged window.
+        max_offset (float): Maximum time difference, in seconds, between a reference sample and the sample matched to it.
+    """
+
+    def __init__(self, boards, reference=0, channels=None, max_offset=None):
+        """
+        Initializes the group.
+
+        Args:
+            boards (list): BrainFlowBoardSetup instances to group.
+            reference (int, optional): Index of the board whose timestamps define the timeline. Default is 0.
+            channels (list, optional): For each board, the rows to include in merged windows. Defaults to each board's EEG channels.
+            max_offset (float, optional): Maximum time difference, in seconds, for two samples to be matched.
+                Defaults to one sample period of the reference board.
+        """
+        self.boards = list(boards)
+        self.reference = reference
+        if channels is None:
+            channels = [[row for row in board.eeg_channels if board.channel_rows is None or row in board.channel_rows] for board in self.boards]
+        self.channels = [list(rows) for rows in channels]
+        self.channel_labels = [(board.name, row) for board, rows in zip(self.boards, self.channels) for row in rows]
+        self.max_offset = max_offset if max_offset is not None else 1.0 / (self.boards[reference].sampling_rate or 250)
+
+    def __len__(self):
+        return len(self.boards)
+
+    def __iter__(self):
+        return iter(self.boards)
+
+    def setup(self, poll_interval=0.02, history_seconds=60, **kwargs):
+        """
+        Sets up all boards concurrently, each with a background acquisition thread, so their streams start as close together as possible.
+
+        Args:
+            poll_interval (float): Seconds between two drains of each BoardShim. Default is 0.02.
+            history_seconds (float): Seconds of history kept in each board's buffer. Default is 60.
+            **kwargs: Additional keyword arguments passed to each board's setup() (e.g. stall_timeout, buffer_seconds).
+
+        Returns:
+            bool: True if every board is streaming, False otherwise.
+        """
+        self._assign_serial_ports()
+        boards = [board for board in self.boards if board.serial_port is not None or board.master_board is not None]
+        if boards:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(boards)) as executor:
+                list(executor.map(lambda board: board.setup(background=True, poll_interval=poll_interval, history_seconds=history_seconds, **kwargs), boards))
+
+        if not self.is_streaming():
+            print("Not all boards in the group are streaming.")
+            return False
+        return True
+
+    def _assign_serial_ports(self):
+        """
+        Auto-detects the serial ports of the boards created without one, once per board type and before any board is
+        set up, so concurrent setups never probe the same ports, pick the same dongle or write the port cache together.
+        Ports already given to another board of the group are not reassigned; boards left without a port are reported.
+        """
+        taken = {board.serial_port for board in self.boards if board.serial_port}
+        missing = [board for board in self.boards if board.serial_port is None and board.master_board is None]
+        for board_id in dict.fromkeys(board.board_id for board in missing):
+            boards = [board for board in missing if board.board_id == board_id]
+            print(f"No serial port provided for {len(boards)} board(s), attempting to auto-detect...")
+            ports_info = boards[0].find_device_ports(parallel=True, max_devices=len(boards) + len(taken), prefilter='rank', use_cache=True)
+            ports = [info['port'] for info in ports_info if info['port'] not in taken]
+            for board, port in zip(boards, ports):
+                board.serial_port = port
+                taken.add(port)
+            for board in boards[len(ports):]:
+                print(f"[{board.name}] No compatible device found. Setup failed.")
+
+    def is_streaming(self):
+        """
+        Checks if every board in the group is streaming in background mode.
+
+        Returns:
+            bool: True if all boards are streaming, False otherwise.
+        """
+        return all(board.is_streaming() and board.background for board in self.boards)
+
+    def get_current_timestamps(self, board_index, num_samples):
+        """
+        Retrieves the timestamps of the most recent num_samples samples of one board.
+
+        Args:
+            board_index (int): Index of the board in the group.
+            num_samples (int): Number of recent samples.
+
+        Returns:
+            numpy.ndarray: 1D array of timestamps in seconds.
+        """
+        return self.boards[board_index].get_current_window(num_samples, channels=[])[1]
+
+    def get_current_window(self, num_samples):
+        """
+        Retrieves the most recent num_samples samples of every board, aligned onto the reference board's timeline.
+
+        The timeline ends at the newest timestamp that every board has already reached, so no board is padded at the end
+        just because its acquisition thread drained a little later than the others.
+
+        Args:
+            num_samples (int): Number of samples in the merged window.
+
+        Returns:
+            tuple: The merged (channels x samples) array, with rows ordered as in channel_labels, and the 1D array of
+                reference timestamps. Both are empty if no board has data yet.
+        """
+        num_samples = int(num_samples)
+        latest = [self.get_current_timestamps(i, 1) for i in range(len(self.boards))]
+        if any(ts.size == 0 for ts in latest):
+            return np.empty((len(self.channel_labels), 0)), np.empty(0)
+        t_end = min(ts[-1] for ts in latest)
+
+        # Fetch a little more than needed from each board to cover drain-time differences between boards
+        margin = int(self.boards[self.reference].sampling_rate or 250)
+        reference_ts = self.get_current_timestamps(self.reference, num_samples + margin)
+        reference_ts = reference_ts[:np.searchsorted(reference_ts, t_end, side='right')][-num_samples:]
+
+        merged = np.full((len(self.channel_labels), reference_ts.size), np.nan)
+        row = 0
+        for i, rows in enumerate(self.channels):
+            merged[row:row + len(rows)] = self._align(i, rows, reference_ts, num_samples + 2 * margin)
+            row += len(rows)
+
+        return merged, reference_ts
+
+    def _align(self, board_index, rows, target_ts, num_samples):
+        """
+        Picks, for every target timestamp, the nearest sample of a board; targets without a sample within max_offset get NaN.
+
+        Args:
+            board_index (int): Index of the board in the group.
+            rows (list): Rows of the board data to align.
+            target_ts (numpy.ndarray): Timestamps of the common timeline.
+            num_samples (int): Number of recent samples of the board to search.
+
+        Returns:
+            numpy.ndarray: A (len(rows) x len(target_ts)) array.
+        """
+        data, ts = self.boards[board_index].get_current_window(num_samples, channels=rows)
+        n = ts.size
+
+        aligned = np.full((len(rows), target_ts.size), np.nan)
+        if n == 0:
+            return aligned
+        right = np.clip(np.searchsorted(ts, target_ts), 0, n - 1)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(np.abs(ts[left] - target_ts) <= np.abs(ts[right] - target_ts), left, right)
+        valid = np.abs(ts[nearest] - target_ts) <= self.max_offset
+        aligned[:, valid] = data[:, nearest[valid]]
+        return aligned
+
+    def get_memory_footprint(self):
+        """
+        Reports the memory used by the sample buffers of every board in the group.
+
+        Returns:
+            dict: Each board's get_memory_footprint() keyed by board name, plus 'total_bytes' for the whole group.
+        """
+        footprint = {board.name: board.get_memory_footprint() for board in self.boards}
+        footprint['total_bytes'] = sum(board['total_bytes'] for board in footprint.values())
+        return footprint
+
+    def stop(self):
+        """
+        Stops streaming and releases the sessions of all boards in the group.
+        """
+        for board in self.boards:
+            board.stop()
@@ -1,6 +1,560 @@
+import collections
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
 import brainflow
 from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
-import serial.tools.list_ports
+from brainflow.data_filter import DataFilter
+# asyncio and pyserial are imported where first needed (async API, port auto-detection) to keep this module quick to
+# import; see import_budget.py
+
+# USB (vendor ID, product ID) pairs of the serial dongles used by OpenBCI boards (FTDI FT231X on the Cyton dongle)
+KNOWN_DONGLE_IDS = {(0x0403, 0x6015)}
+# Substrings of serial port descriptions that identify likely dongles when the USB IDs are not reported
+KNOWN_DONGLE_DESCRIPTIONS = ('FT231X', 'OpenBCI')
+# Number of samples the native BrainFlow buffer holds unless setup() is given a duration or byte budget
+DEFAULT_NATIVE_BUFFER_SIZE = 450000
+# Default location of the on-disk cache of the last port that worked for each dongle serial number
+PORT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.brainflow_port_cache.json')
+# The package number channel of OpenBCI packets counts 0..255 and wraps around
+PACKAGE_NUM_MODULUS = 256
+# Probe run in a child interpreter by find_device_ports(parallel=True): BrainFlow serializes every native call of a
+# process under one lock, so concurrent probes (and their timeouts) only work in separate processes.
+# Arguments: board ID, port, BrainFlowInputParams as JSON. Prints the status and the seconds the probe took.
+_PROBE_SCRIPT = """
+import json, sys, time
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError
+BoardShim.disable_board_logger()
+params = BrainFlowInputParams()
+for key, value in json.loads(sys.argv[3]).items():
+    setattr(params, key, value)
+params.serial_port = sys.argv[2]
+start = time.perf_counter()
+try:
+    board = BoardShim(int(sys.argv[1]), params)
+    board.prepare_session()
+    board.release_session()
+    status = 'compatible'
+except BrainFlowError:
+    status = 'incompatible'
+print(status, time.perf_counter() - start)
+"""
+
+class RingBuffer:
+    """
+    A preallocated, channel-major circular buffer of board samples.
+
+    Samples are stored in a single (rows x capacity) NumPy array that is allocated once. Reads of the latest
+    samples return read-only views into that array, or a single contiguous copy when the requested window
+    wraps around the end of the buffer, so steady-state reads do not allocate sample memory.
+
+    Views remain valid until the writer wraps around and overwrites them (capacity - num_samples samples later).
+    Copy them if they need to be kept for longer.
+
+    Attributes:
+        data (numpy.ndarray): The (rows x capacity) storage array.
+        capacity (int): Number of samples the buffer can hold.
+        total_written (int): Total number of samples written since creation (index one past the newest sample).
+    """
+
+    def __init__(self, num_rows, capacity, dtype=np.float64, data=None):
+        """
+        Allocates the buffer.
+
+        Args:
+            num_rows (int): Number of rows (channels) per sample.
+            capacity (int): Number of samples the buffer can hold.
+            dtype (numpy.dtype, optional): Data type of the storage array. Default is float64.
+            data (numpy.ndarray, optional): Existing (num_rows x capacity) array to use as storage instead of allocating one
+                (e.g. an array backed by shared memory).
+        """
+        self.data = data if data is not None else np.zeros((num_rows, capacity), dtype=dtype)
+        self.capacity = capacity
+        self.total_written = 0
+
+    @property
+    def num_rows(self):
+        return self.data.shape[0]
+
+    @property
+    def oldest_index(self):
+        """
+        int: Index of the oldest sample still held in the buffer.
+        """
+        return max(0, self.total_written - self.capacity)
+
+    def write(self, chunk):
+        """
+        Copies a (rows x samples) chunk into the buffer, overwriting the oldest samples once full.
+
+        Args:
+            chunk (numpy.ndarray): The samples to append. Only the last capacity samples are kept if it is larger than the buffer.
+        """
+        num_samples = chunk.shape[1]
+        if num_samples > self.capacity:
+            self.total_written += num_samples - self.capacity
+            chunk = chunk[:, -self.capacity:]
+            num_samples = self.capacity
+
+        start = self.total_written % self.capacity
+        first = min(num_samples, self.capacity - start)
+        self.data[:, start:start + first] = chunk[:, :first]
+        if first < num_samples:
+            self.data[:, :num_samples - first] = chunk[:, first:]
+        self.total_written += num_samples
+
+    def latest(self, num_samples, rows=None):
+        """
+        Returns the latest num_samples samples (fewer if the buffer does not hold that many yet).
+
+        Args:
+            num_samples (int): Number of samples to return.
+            rows (slice | list | int, optional): Rows to return. A slice (or a list of evenly spaced indices) keeps the
+                result a view; any other selection is gathered into a copy. Defaults to all rows.
+
+        Returns:
+            numpy.ndarray: A read-only (rows x samples) view, or a copy if the window wraps around or rows cannot be sliced.
+        """
+        return self.read(self.total_written - int(num_samples), self.total_written, rows)
+
+    def read(self, start_index, stop_index, rows=None):
+        """
+        Returns the samples in [start_index, stop_index), clipped to what the buffer still holds.
+
+        Args:
+            start_index (int): Index of the first sample to return.
+            stop_index (int): Index one past the last sample to return.
+            rows (slice | list | int, optional): Rows to return, see latest(). Defaults to all rows.
+
+        Returns:
+            numpy.ndarray: A read-only (rows x samples) view, or a copy if the window wraps around or rows cannot be sliced.
+        """
+        start_index = max(start_index, self.oldest_index)
+        stop_index = min(max(stop_index, start_index), self.total_written)
+        rows = _as_row_slice(rows)
+
+        start = start_index % self.capacity
+        stop = start + (stop_index - start_index)
+        if stop <= self.capacity:
+            window = self.data[rows, start:stop]
+        else:
+            window = np.concatenate((self.data[rows, start:], self.data[rows, :stop - self.capacity]), axis=-1)
+        window.flags.writeable = False
+        return window
+
+    def searchsorted(self, value, row=0, side='left'):
+        """
+        Binary-searches a row whose values increase over time (e.g. timestamps) across the samples still held.
+
+        The held samples form at most two sorted segments of the storage array (before and after the write position),
+        so the search is one numpy.searchsorted call on the segment that can contain the value.
+
+        Args:
+            value (float): The value to search for.
+            row (int): The row to search. Default is 0.
+            side (str): 'left' for the first sample >= value, 'right' for the first sample > value. Default is 'left'.
+
+        Returns:
+            int: Absolute index (between oldest_index and total_written) at which value would be inserted to keep the row sorted.
+        """
+        oldest = self.oldest_index
+        start = oldest % self.capacity
+        stop = start + (self.total_written - oldest)
+        if stop <= self.capacity:
+            return oldest + int(np.searchsorted(self.data[row, start:stop], value, side=side))
+
+        older, newer = self.data[row, start:], self.data[row, :stop - self.capacity]
+        if value > newer[0] if side == 'left' else value >= newer[0]:
+            return oldest + older.size + int(np.searchsorted(newer, value, side=side))
+        return oldest + int(np.searchsorted(older, value, side=side))
+
+
+def _convert_samples(samples, dtype, timestamp_row, timestamp_origin):
+    """
+    Converts float64 samples to dtype. For any other dtype than float64 the timestamp row is stored as seconds since
+    timestamp_origin, as epoch seconds do not fit in float32 (its step is 128 s at current epoch times).
+
+    Args:
+        samples (numpy.ndarray): A float64 (rows x samples) array with absolute timestamps.
+        dtype (numpy.dtype): The target data type.
+        timestamp_row (int): Row of the timestamps in samples, or None if they are not part of it.
+        timestamp_origin (float): Origin subtracted from the timestamps. None takes the first timestamp of samples.
+
+    Returns:
+        tuple: The converted array and the timestamp origin (None while no relative timestamps were stored).
+    """
+    converted = samples.astype(dtype)
+    if timestamp_row is not None and np.dtype(dtype) != np.float64 and samples.shape[1]:
+        if timestamp_origin is None:
+            timestamp_origin = float(samples[timestamp_row, 0])
+        converted[timestamp_row] = samples[timestamp_row] - timestamp_origin
+    return converted, timestamp_origin
+
+
+class SampleConverter:
+    """
+    Converts the chunks handed to data callbacks by a BrainFlowBoardSetup to the dtype of a consumer (recorder,
+    shared memory publisher, stream server), applying the same relative timestamp convention as the board itself.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board whose chunks are converted.
+        dtype (numpy.dtype): Data type of the converted chunks.
+    """
+
+    def __init__(self, board_setup, dtype):
+        """
+        Initializes the converter.
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board whose chunks are converted.
+            dtype (numpy.dtype): Data type of the converted chunks.
+        """
+        self.board_setup = board_setup
+        self.dtype = np.dtype(dtype)
+        self._timestamp_origin = None
+        # Only float64 boards hand out absolute timestamps that a narrower consumer dtype has to make relative
+        self._relative = board_setup.dtype == np.float64 and self.dtype != np.float64
+
+    @property
+    def timestamp_origin(self):
+        """
+        float: Time subtracted from the timestamp row of the converted chunks (None if it holds absolute times).
+        """
+        return self._timestamp_origin if self._relative else self.board_setup.timestamp_origin
+
+    def convert(self, chunk):
+        """
+        Converts a chunk handed to a data callback.
+
+        Args:
+            chunk (numpy.ndarray): The (rows x samples) chunk in the board's dtype.
+
+        Returns:
+            numpy.ndarray: The chunk in dtype (the chunk itself if the dtypes match).
+        """
+        if chunk.dtype == self.dtype:
+            return chunk
+        if not self._relative:
+            return chunk.astype(self.dtype)
+        converted, self._timestamp_origin = _convert_samples(chunk, self.dtype, self.board_setup._stored_timestamp_row, self._timestamp_origin)
+        return converted
+
+
+def _as_row_slice(rows):
+    """
+    Converts a row selection to a slice when possible so that indexing with it returns a view.
+
+    Args:
+        rows (slice | list | int | None): The row selection. None selects all rows.
+
+    Returns:
+        slice | list | int: An equivalent slice, or the selection unchanged if it cannot be expressed as one.
+    """
+    if rows is None:
+        return slice(None)
+    if isinstance(rows, (slice, int, np.integer)):
+        return rows
+    rows = [int(row) for row in rows]
+    if not rows:
+        return slice(0, 0)
+    if len(rows) == 1:
+        return slice(rows[0], rows[0] + 1)
+    step = rows[1] - rows[0] if len(rows) > 1 else 1
+    if step > 0 and all(b - a == step for a, b in zip(rows, rows[1:])):
+        return slice(rows[0], rows[-1] + 1, step)
+    return rows
+
+
+class MarkerQueue:
+    """
+    A queue of event markers timestamped on the caller's side and inserted into the board stream later,
+    in batches, by the background acquisition thread.
+
+    Every marker is logged with the monotonic time at which it was queued. Once the drained data covers that
+    time, the marker is mapped to the sample whose BrainFlow timestamp matches it ('sample_index'); once the marker
+    value shows up in the marker channel, the sample BrainFlow actually tagged is recorded as well ('placed_index'),
+    together with the host-to-sample offset between the two.
+
+    Attributes:
+        events (list): One dictionary per marker with 'value', 'host_time' (monotonic seconds), 'wall_time'
+            (host_time on the time.time() clock used by BrainFlow timestamps), 'flush_time', 'sample_index',
+            'placed_index' and 'offset' (timestamp of the placed sample minus wall_time, in seconds).
+        clock_offset (float): time.time() - time.monotonic(), measured when the queue was created.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.clock_offset = time.time() - time.monotonic()
+        self._pending = collections.deque()  # events queued but not yet inserted into the board
+        self._unplaced = collections.deque()  # events inserted but not yet seen in the marker channel
+        self._unmapped = collections.deque()  # events not yet mapped to a sample by timestamp
+
+    def put(self, value, host_time=None):
+        """
+        Queues a marker. Safe to call from any thread; does no I/O.
+
+        Args:
+            value (float): The marker value (must be non-zero to be found in the marker channel).
+            host_time (float, optional): time.monotonic() of the event. Defaults to now.
+
+        Returns:
+            dict: The event entry, completed as the marker is flushed and mapped.
+        """
+        host_time = time.monotonic() if host_time is None else host_time
+        event = {'value': float(value), 'host_time': host_time, 'wall_time': host_time + self.clock_offset,
+                 'flush_time': None, 'sample_index': None, 'placed_index': None, 'offset': None}
+        self.events.append(event)
+        self._pending.append(event)
+        self._unmapped.append(event)
+        return event
+
+    def flush(self, board, name=None, verbose=False):
+        """
+        Inserts every pending marker into the board stream.
+
+        Args:
+            board (BoardShim): The streaming board.
+            name (str, optional): Board name used in messages.
+            verbose (bool): Whether to print a line per inserted marker. Default is False.
+        """
+        while self._pending:
+            event = self._pending.popleft()
+            try:
+                board.insert_marker(event['value'])
+            except BrainFlowError as e:
+                print(f"[{name}] Error inserting marker: {e}")
+                continue
+            event['flush_time'] = time.monotonic()
+            self._unplaced.append(event)
+            if verbose:
+                print(f"[{name}] Marker {event['value']} inserted with {1000 * (event['flush_time'] - event['host_time']):.1f} ms queue delay.")
+
+    def map_chunk(self, start_index, timestamps, markers):
+        """
+        Maps logged markers onto the samples of a newly drained chunk.
+
+        Args:
+            start_index (int): Absolute sample index of the first sample of the chunk.
+            timestamps (numpy.ndarray): Timestamp row of the chunk.
+            markers (numpy.ndarray): Marker row of the chunk.
+        """
+        if timestamps.size == 0:
+            return
+        while self._unmapped and self._unmapped[0]['wall_time'] <= timestamps[-1]:
+            event = self._unmapped.popleft()
+            event['sample_index'] = start_index + int(np.searchsorted(timestamps, event['wall_time']))
+
+        for position in np.flatnonzero(markers):
+            if not self._unplaced:
+                break
+            if markers[position] != self._unplaced[0]['value']:
+                continue  # marker inserted directly with insert_marker(queued=False)
+            event = self._unplaced.popleft()
+            event['placed_index'] = start_index + int(position)
+            event['offset'] = float(timestamps[position]) - event['wall_time']
+
+
+class PacketGapDetector:
+    """
+    Detects dropped packets in drained chunks from the rolling package number channel, and optionally fills the gaps
+    so that every window of N samples really spans N sample periods.
+
+    Every chunk is checked in one vectorized pass: the step between consecutive package numbers (modulo the counter
+    range, continuing from the last packet of the previous chunk) is 1 for consecutive packets, and any larger step
+    means step - 1 packets were lost. Gaps of a whole counter cycle or more cannot be told apart from no gap.
+
+    Filled samples get NaN ('nan') or values linearly interpolated between the samples around the gap ('interpolate')
+    in every data row. Whatever the fill mode, the timestamp row is interpolated, the package number row continues the
+    sequence and the marker row is 0, so timestamp lookups and marker mapping keep working across the gap.
+
+    Attributes:
+        package_row (int): Row of the package number channel.
+        modulus (int): Range of the package counter.
+        fill (str): None (only count), 'nan' or 'interpolate'.
+        received (int): Number of packets received so far.
+        lost (int): Number of packets lost so far.
+        gap_events (int): Number of gaps (runs of consecutive lost packets) so far.
+        largest_gap (int): Number of packets lost in the largest gap so far.
+        filled (int): Number of samples inserted into the stream to fill gaps.
+    """
+
+    FILL_MODES = (None, 'nan', 'interpolate')
+
+    def __init__(self, package_row, modulus=PACKAGE_NUM_MODULUS, fill=None, timestamp_row=None, marker_row=None):
+        """
+        Initializes the detector.
+
+        Args:
+            package_row (int): Row of the package number channel in the chunks.
+            modulus (int, optional): Range of the package counter. Default is PACKAGE_NUM_MODULUS (256).
+            fill (str, optional): None to only count lost packets, 'nan' or 'interpolate' to also fill the gaps. Default is None.
+            timestamp_row (int, optional): Row of the timestamp channel, interpolated across filled gaps.
+            marker_row (int, optional): Row of the marker channel, set to 0 in filled gaps.
+
+        Raises:
+            ValueError: If fill is not one of FILL_MODES.
+        """
+        if fill not in self.FILL_MODES:
+            raise ValueError(f"Unknown fill mode '{fill}', expected one of {self.FILL_MODES}.")
+        self.package_row = package_row
+        self.modulus = modulus
+        self.fill = fill
+        self.timestamp_row = timestamp_row
+        self.marker_row = marker_row
+        self.received = 0
+        self.lost = 0
+        self.gap_events = 0
+        self.largest_gap = 0
+        self.filled = 0
+        self._last_column = None  # last sample of the previous chunk, anchor for the next step and interpolation
+
+    def restart_sequence(self):
+        """
+        Forgets the last package number, e.g. after a reconnect restarted the counter, so no gap is counted across it.
+        """
+        self._last_column = None
+
+    def process(self, chunk):
+        """
+        Counts the packets lost before and within a chunk, and fills the gaps if a fill mode is set.
+
+        Args:
+            chunk (numpy.ndarray): A (rows x samples) array as returned by BoardShim.get_board_data().
+
+        Returns:
+            numpy.ndarray: The chunk itself, or a longer copy with the filled samples inserted.
+        """
+        num_samples = chunk.shape[1]
+        if num_samples == 0:
+            return chunk
+        counters = chunk[self.package_row]
+        if self._last_column is not None:
+            counters = np.concatenate(([self._last_column[self.package_row]], counters))
+        # A step of 0 (repeated packet) counts as no loss rather than a whole lost cycle
+        missing = np.maximum(np.mod(np.diff(counters), self.modulus) - 1, 0).astype(np.int64)
+        if self._last_column is None:
+            missing = np.concatenate(([0], missing))
+
+        self.received += num_samples
+        num_lost = int(missing.sum())
+        if num_lost:
+            self.lost += num_lost
+            self.gap_events += int(np.count_nonzero(missing))
+            self.largest_gap = max(self.largest_gap, int(missing.max()))
+            if self.fill is not None:
+                chunk = self._fill(chunk, missing)
+        self._last_column = np.array(chunk[:, -1])
+        return chunk
+
+    def _fill(self, chunk, missing):
+        """
+        Inserts missing[i] samples before column i of the chunk.
+        """
+        num_samples = chunk.shape[1]
+        positions = np.arange(num_samples) + np.cumsum(missing)  # columns of the received samples in the output
+        filled = np.empty((chunk.shape[0], num_samples + int(missing.sum())), dtype=chunk.dtype)
+        filled[:, positions] = chunk
+        gap_mask = np.ones(filled.shape[1], dtype=bool)
+        gap_mask[positions] = False
+        gap_columns = np.flatnonzero(gap_mask)
+
+        # Samples around each gap: the previous chunk's last sample (if any) sits at column -1
+        anchor_columns, anchors = positions, chunk
+        if self._last_column is not None:
+            anchor_columns = np.concatenate(([-1], positions))
+            anchors = np.concatenate((self._last_column[:, None], chunk), axis=1)
+        right = np.searchsorted(anchor_columns, gap_columns)
+        left = right - 1
+        weight = (gap_columns - anchor_columns[left]) / (anchor_columns[right] - anchor_columns[left])
+        interpolated = anchors[:, left] * (1 - weight) + anchors[:, right] * weight
+
+        filled[:, gap_columns] = interpolated if self.fill == 'interpolate' else np.nan
+        if self.timestamp_row is not None:
+            filled[self.timestamp_row, gap_columns] = interpolated[self.timestamp_row]
+        if self.marker_row is not None:
+            filled[self.marker_row, gap_columns] = 0
+        filled[self.package_row, gap_columns] = np.mod(anchors[self.package_row, right] - (anchor_columns[right] - gap_columns), self.modulus)
+        self.filled += gap_columns.size
+        return filled
+
+    def get_stats(self):
+        """
+        Reports the cumulative packet loss statistics.
+
+        Returns:
+            dict: 'received', 'lost', 'loss_ratio' (lost / (received + lost)), 'gap_events', 'largest_gap' and 'filled'.
+        """
+        total = self.received + self.lost
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'loss_ratio': self.lost / total if total else 0.0,
+            'gap_events': self.gap_events,
+            'largest_gap': self.largest_gap,
+            'filled': self.filled,
+        }
+
+
+def resolve_channels(board_id, channels):
+    """
+    Resolves a channel selection against a board descriptor into board data rows and labels.
+
+    Args:
+        board_id (int): The board (or master board) whose descriptor is used.
+        channels (str | list): Either a '+'-separated string of channel groups from the descriptor (e.g. 'eeg',
+            'eeg+marker', 'eeg+accel+timestamp'), or a list mixing row indices, group names and EEG electrode names
+            (e.g. ['C3', 'C4', 'marker']).
+
+    Returns:
+        tuple: The list of board data rows (in selection order, without duplicates) and the list of their labels.
+
+    Raises:
+        ValueError: If a name matches neither a channel group nor an EEG electrode of the board.
+    """
+    board_descr = BoardShim.get_board_descr(board_id)
+    eeg_names = board_descr.get('eeg_names', '').split(',') if board_descr.get('eeg_names') else []
+    labels = {}
+    for key, value in board_descr.items():
+        if key.endswith('_channels'):
+            group = key[:-len('_channels')]
+            for i, row in enumerate(value):
+                labels.setdefault(row, f"{group}_{i}")
+        elif key.endswith('_channel'):
+            labels.setdefault(value, key[:-len('_channel')])
+    for name, row in zip(eeg_names, board_descr.get('eeg_channels', [])):
+        labels[row] = name
+
+    if isinstance(channels, str):
+        channels = channels.split('+')
+    rows = []
+    for channel in channels:
+        if isinstance(channel, (int, np.integer)):
+            found = [int(channel)]
+        elif f"{channel}_channels" in board_descr:
+            found = list(board_descr[f"{channel}_channels"])
+        elif f"{channel}_channel" in board_descr:
+            found = [board_descr[f"{channel}_channel"]]
+        elif channel in eeg_names:
+            found = [board_descr['eeg_channels'][eeg_names.index(channel)]]
+        else:
+            raise ValueError(f"Unknown channel '{channel}' for board {board_descr.get('name', board_id)}.")
+        rows += [row for row in found if row not in rows]
+    return rows, [labels.get(row, f"row_{row}") for row in rows]
+
+
+def _set_future_result(future, result):
+    """
+    Sets the result of an asyncio future unless it was already resolved or cancelled.
+    """
+    if not future.done():
+        future.set_result(result)
+
 
 class BrainFlowBoardSetup:
     """
@@ -17,13 +571,21 @@ class BrainFlowBoardSetup:
         board (BoardShim): Instance of BoardShim representing the active board.
         session_prepared (bool): Flag indicating if the session has been prepared.
         streaming (bool): Flag indicating if the board is actively streaming data.
+        native_buffer_size (int): Number of samples of the native BrainFlow buffer requested by setup().
         eeg_channels (list): List of EEG channel indices for the board (empty if not applicable).
         sampling_rate (int): Sampling rate of the board.
+        background (bool): Flag indicating if a background thread is draining the board into this instance's buffer.
+        latest_sample_index (int): Total number of samples drained by the background thread (index one past the newest sample).
+        data_condition (threading.Condition): Notified by the background thread every time a new chunk of samples arrives.
+        buffer (RingBuffer): Preallocated buffer filled by the background thread (None until background acquisition starts).
+        markers (MarkerQueue): Log and queue of markers inserted with insert_marker(queued=True).
+        channel_rows (list): Board data rows kept by the buffer, in order (None if every row is kept).
+        channel_names (list): Labels of channel_rows, e.g. electrode names for EEG rows (None if every row is kept).
     """
 
     _id_counter = 0  # Class-level variable to assign default IDs
 
-    def __init__(self, board_id, serial_port=None, master_board=None, name=None, **kwargs):
+    def __init__(self, board_id, serial_port=None, master_board=None, name=None, channels=None, dtype=np.float64, **kwargs):
         """
         Initializes the BrainFlowBoardSetup class with the given board ID, serial port, master board, and additional parameters.
 
@@ -32,6 +594,11 @@ class BrainFlowBoardSetup:
             serial_port (str, optional): The serial port to which the BrainFlow board is connected.
             master_board (int, optional): The master board ID, used for playback or synthetic boards.
             name (str, optional): A user-friendly name or identifier for this instance. Defaults to 'Board X'.
+            channels (str | list, optional): Channel selection kept by the background buffer and returned by data requests,
+                e.g. 'eeg', 'eeg+marker' or ['C3', 'C4', 22]. See resolve_channels(). Defaults to every row of the board data.
+            dtype (numpy.dtype, optional): Data type of the samples kept by the background buffer and handed to data callbacks
+                (recorder, shared memory, stream server). float32 halves memory and bandwidth; its timestamp row then holds
+                seconds since timestamp_origin, as epoch seconds do not fit in float32. Default is float64.
             **kwargs: Additional keyword arguments to be set as attributes on the BrainFlowInputParams instance.
         """
         self.instance_id = BrainFlowBoardSetup._id_counter  # Unique identifier for each instance
@@ -61,6 +628,13 @@ class BrainFlowBoardSetup:
             self.eeg_channels = []
             self.sampling_rate = None
 
+        # Resolve the channel selection: in background mode only these rows are buffered and returned
+        self.channel_rows, self.channel_names = None, None
+        if channels is not None:
+            self.channel_rows, self.channel_names = resolve_channels(self._board_to_use(), channels)
+        self._row_positions = {row: i for i, row in enumerate(self.channel_rows or [])}
+        self._row_selection = _as_row_slice(self.channel_rows) if self.channel_rows is not None else None
+
         # Apply additional parameters
         for key, value in kwargs.items():
             if hasattr(self.params, key):
@@ -72,6 +646,42 @@ class BrainFlowBoardSetup:
         self.board = None
         self.session_prepared = False
         self.streaming = False
+        self.native_buffer_size = None
+
+        # Background acquisition state (only used when setup(background=True))
+        self.background = False
+        self.poll_interval = None
+        self.buffer = None  # RingBuffer filled by the background thread
+        self.latest_sample_index = 0
+        self.data_condition = threading.Condition()
+        self._acquisition_thread = None
+        self._stop_acquisition = threading.Event()
+        self._read_index = 0  # first sample not yet returned by get_board_data()
+        self._data_callbacks = []  # called with every drained chunk, see add_data_callback()
+        self._async_waiters = []  # (event loop, future, sample index) of pending wait_for_samples_async() calls
+        self.markers = MarkerQueue()
+        self._verbose_markers = False
+        self._timestamp_row = None
+        self._marker_row = None
+        self._timestamps = None  # RingBuffer of the timestamp row, kept whatever the channel selection
+        self.dtype = np.dtype(dtype)
+        self.timestamp_origin = None  # first timestamp, subtracted from the stored timestamp row when dtype is not float64
+        self._stored_timestamp_row = None  # row of the timestamp channel in the buffer, if it is part of the selection
+        self.packet_gaps = None  # PacketGapDetector run on every drained chunk, see get_packet_loss_stats()
+
+        # Replay state (see start_replay())
+        self.replay_finished = threading.Event()
+        self.replay_seconds = None
+
+        # Stream watchdog state (only used when start_acquisition(stall_timeout=...))
+        self.stall_timeout = None
+        self.min_rate_fraction = None
+        self.reconnect_count = 0
+        self.gaps = []
+        self._arrivals = collections.deque()  # (monotonic time, number of samples) of recent drains
+        self._last_arrival = None
+        self._watch_start = None
+        self.port_probe_report = []
     
     def __getattr__(self, name):
         """
@@ -105,7 +715,7 @@ class BrainFlowBoardSetup:
         if self.board_id not in [BoardIds.PLAYBACK_FILE_BOARD.value, BoardIds.SYNTHETIC_BOARD.value] and self.master_board:
             raise ValueError(f"Master board is only used for PLAYBACK_FILE_BOARD (-3) and SYNTHETIC_BOARD (-1). But {self.board_id} was provided.")
 
-        board_to_use = self.master_board if self.master_board is not None else self.board_id
+        board_to_use = self._board_to_use()
         board_descr = BoardShim.get_board_descr(board_to_use)
         
         eeg_channels = board_descr.get("eeg_channels", [])
@@ -113,28 +723,79 @@ class BrainFlowBoardSetup:
         
         return eeg_channels, sampling_rate
 
-    def find_device_ports(self):
+    def find_device_ports(self, parallel=False, max_workers=4, port_timeout=10.0, max_devices=None, report=True,
+                          prefilter=None, use_cache=False, cache_path=PORT_CACHE_PATH):
         """
         Finds all compatible BrainFlow devices by checking the available serial ports.
 
         This method iterates over available serial ports on the computer and attempts
         to detect and verify BrainFlow-compatible devices by initializing a session.
+        With parallel=True, ports are probed concurrently, each in its own child process (BrainFlow runs the native calls
+        of a process one at a time); a probe that does not finish within port_timeout seconds is killed, and the search
+        stops as soon as max_devices boards are confirmed.
+
+        Before any port is opened, candidates can be ranked or skipped using the USB metadata reported by
+        serial.tools.list_ports (see KNOWN_DONGLE_IDS and KNOWN_DONGLE_DESCRIPTIONS). With use_cache=True, ports whose
+        dongle serial number previously worked for this board are probed first, on their own, so a warm start with
+        max_devices=1 needs a single prepare_session(); confirmed devices are written back to the cache.
+
+        The time spent on each port is stored in port_probe_report (a list of dictionaries with 'port',
+        'seconds' and 'status', one of 'compatible', 'incompatible', 'timeout' or 'skipped') and printed if report is True.
+
+        Args:
+            parallel (bool): Whether to probe ports concurrently. Default is False.
+            max_workers (int): Maximum number of ports probed at the same time in parallel mode. Default is 4.
+            port_timeout (float): Seconds after which a probe still running is killed in parallel mode. Default is 10.0.
+            max_devices (int, optional): Stop searching once this many compatible devices are found. Default is None (probe all ports).
+            report (bool): Whether to print the per-port timing report. Default is True.
+            prefilter (str, optional): 'rank' to probe likely dongles first, 'skip' to only probe likely dongles
+                (and cached ports). Default is None (probe every port in the order reported by the OS).
+            use_cache (bool): Whether to use and update the discovery cache. Default is False.
+            cache_path (str): Path of the discovery cache file. Default is PORT_CACHE_PATH.
 
         Returns:
             list: A list of dictionaries containing 'port', 'serial_number', and 'description' for each compatible device.
                     Returns an empty list if no devices are found.
         """
+        import serial.tools.list_ports
+
         BoardShim.disable_board_logger()
         ports = serial.tools.list_ports.comports()
         compatible_ports = []
-
-        for port in ports:
-            try:
-                self.params.serial_port = port.device
-                board = BoardShim(self.board_id, self.params)
-                board.prepare_session()
-                board.release_session()
-                
+        self.port_probe_report = []
+
+        cache = self._load_port_cache(cache_path) if use_cache else {}
+        cached_serials = cache.get(str(self.board_id), {})
+        if prefilter is not None:
+            ports = self._rank_ports(ports, cached_serials, skip=(prefilter == 'skip'))
+
+        # Warm start: verify the cached dongles on their own before scanning anything else
+        results = []
+        cached_ports = [port for port in ports if port.serial_number in cached_serials]
+        for port in cached_ports:
+            status, seconds = self._probe_port(port.device)
+            results.append((port, status, seconds))
+        ports = [port for port in ports if port not in cached_ports]
+        found = sum(status == 'compatible' for _, status, _ in results)
+        if max_devices is not None:
+            max_devices -= found
+            if max_devices <= 0:
+                results += [(port, 'skipped', 0.0) for port in ports]
+                ports = []
+
+        if parallel and ports:
+            results += self._probe_ports_parallel(ports, max_workers, port_timeout, max_devices)
+        else:
+            for port in ports:
+                if max_devices is not None and sum(status == 'compatible' for _, status, _ in results) - found >= max_devices:
+                    results.append((port, 'skipped', 0.0))
+                    continue
+                status, seconds = self._probe_port(port.device)
+                results.append((port, status, seconds))
+
+        for port, status, seconds in results:
+            self.port_probe_report.append({'port': port.device, 'seconds': seconds, 'status': status})
+            if status == 'compatible':
                 device_info = {
                     'port': port.device,
                     'serial_number': port.serial_number,
@@ -142,28 +803,190 @@ class BrainFlowBoardSetup:
                 }
                 print(f"Compatible device found: Serial Number: {port.serial_number}, Description: {port.description}")
                 compatible_ports.append(device_info)
-            except BrainFlowError:
-                continue
-        
+
+        if report:
+            print(f"[{self.name}] Port probe report:")
+            for entry in self.port_probe_report:
+                print(f"  {entry['port']}: {entry['seconds']:.2f} s ({entry['status']})")
+
         if not compatible_ports:
             print(f"No compatible BrainFlow devices found.")
+        elif use_cache:
+            for device in compatible_ports:
+                if device['serial_number']:
+                    cached_serials[device['serial_number']] = device['port']
+            cache[str(self.board_id)] = cached_serials
+            self._save_port_cache(cache_path, cache)
         
         BoardShim.enable_board_logger()
         return compatible_ports
 
-    def setup(self):
+    @staticmethod
+    def _rank_ports(ports, cached_serials, skip=False):
+        """
+        Orders serial ports so that cached dongles come first, then ports matching a known dongle USB VID/PID,
+        then ports whose description looks like a dongle, then everything else.
+
+        Args:
+            ports (list): Ports as returned by serial.tools.list_ports.comports().
+            cached_serials (dict): Dongle serial numbers (keys) that previously worked for this board.
+            skip (bool): Whether to drop ports that match none of the criteria. Default is False.
+
+        Returns:
+            list: The ranked (and possibly filtered) ports.
+        """
+        def rank(port):
+            if port.serial_number in cached_serials:
+                return 0
+            if (getattr(port, 'vid', None), getattr(port, 'pid', None)) in KNOWN_DONGLE_IDS:
+                return 1
+            if any(name in (port.description or '') for name in KNOWN_DONGLE_DESCRIPTIONS):
+                return 2
+            return 3
+
+        ranked = sorted(ports, key=rank)
+        if skip:
+            ranked = [port for port in ranked if rank(port) < 3]
+        return ranked
+
+    @staticmethod
+    def _load_port_cache(cache_path):
+        """
+        Reads the discovery cache, a JSON mapping of board ID -> {dongle serial number: port}.
+
+        Returns:
+            dict: The cache contents, or an empty dictionary if the file is missing or unreadable.
+        """
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_port_cache(cache_path, cache):
+        """
+        Writes the discovery cache. Failures are reported but never interrupt device discovery.
+        """
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            print(f"Warning: could not write port cache {cache_path}: {e}")
+
+    def _probe_port(self, port):
+        """
+        Checks whether the board answers on the given serial port by preparing and releasing a session.
+
+        Args:
+            port (str): The serial port to probe.
+
+        Returns:
+            tuple: The status ('compatible' or 'incompatible') and the number of seconds the probe took.
+        """
+        params = BrainFlowInputParams()
+        for key, value in vars(self.params).items():
+            setattr(params, key, value)
+        params.serial_port = port
+
+        start = time.perf_counter()
+        try:
+            board = BoardShim(self.board_id, params)
+            board.prepare_session()
+            board.release_session()
+            status = 'compatible'
+        except BrainFlowError:
+            status = 'incompatible'
+        return status, time.perf_counter() - start
+
+    def _probe_ports_parallel(self, ports, max_workers, port_timeout, max_devices):
+        """
+        Probes ports in up to max_workers child processes at a time, killing probes that exceed port_timeout.
+
+        Args:
+            ports (list): Ports as returned by serial.tools.list_ports.comports().
+            max_workers (int): Maximum number of concurrent probes.
+            port_timeout (float): Seconds after which a running probe is killed.
+            max_devices (int, optional): Stop once this many compatible devices are confirmed.
+
+        Returns:
+            list: (port, status, seconds) tuples in the order of the ports argument. The seconds of a finished probe
+                are measured in its child process, excluding interpreter startup.
+        """
+        params = json.dumps(vars(self.params))
+        queue = collections.deque(ports)
+        running = {}  # port device -> (port, process, perf_counter() at launch)
+        results = {}
+        try:
+            while queue or running:
+                while queue and len(running) < max_workers:
+                    port = queue.popleft()
+                    process = subprocess.Popen([sys.executable, '-c', _PROBE_SCRIPT, str(self.board_id), port.device, params],
+                                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+                    running[port.device] = (port, process, time.perf_counter())
+
+                time.sleep(0.05)
+                now = time.perf_counter()
+                for device, (port, process, started) in list(running.items()):
+                    if process.poll() is not None:
+                        output = process.stdout.read().split()
+                        if process.returncode == 0 and len(output) == 2:
+                            results[device] = (port, output[0], float(output[1]))
+                        else:
+                            results[device] = (port, 'incompatible', now - started)
+                    elif now - started > port_timeout:
+                        process.kill()
+                        results[device] = (port, 'timeout', now - started)
+                    else:
+                        continue
+                    process.wait()
+                    process.stdout.close()
+                    del running[device]
+
+                if max_devices is not None and sum(status == 'compatible' for _, status, _ in results.values()) >= max_devices:
+                    break
+        finally:
+            now = time.perf_counter()
+            for device, (port, process, started) in running.items():
+                process.kill()
+                process.wait()
+                process.stdout.close()
+                results[device] = (port, 'skipped', now - started)
+        for port in queue:
+            results[port.device] = (port, 'skipped', 0.0)
+        return [results[port.device] for port in ports if port.device in results]
+
+    def setup(self, background=False, poll_interval=0.02, history_seconds=60, stall_timeout=None, buffer_seconds=None, buffer_bytes=None,
+              fill_gaps=None):
         """
         Prepares the session and starts the data stream from the BrainFlow board.
 
         If no serial port is provided during initialization, this method attempts to auto-detect
         a compatible device. Once the board is detected or provided, it prepares the session and starts streaming.
 
+        When background is True, a dedicated thread drains the BoardShim every poll_interval seconds into
+        this instance's own buffer, so get_board_data/get_current_board_data never block on the native call.
+        Use wait_for_samples() (or data_condition) to wake up as soon as a new chunk arrives.
+
+        Args:
+            background (bool): Whether to start the background acquisition thread. Default is False.
+            poll_interval (float): Seconds between two drains of the BoardShim in background mode. Default is 0.02.
+            history_seconds (float): Seconds of history kept in the buffer in background mode. Default is 60.
+            stall_timeout (float, optional): In background mode, reconnect the board when samples stop arriving for this
+                many seconds. See start_acquisition(). Default is None (no watchdog).
+            buffer_seconds (float, optional): Seconds of data the native BrainFlow buffer can hold. In background mode
+                it only has to cover a few poll intervals. Default is None (450000 samples, or buffer_bytes if given).
+            buffer_bytes (int, optional): Memory budget, in bytes, for the native BrainFlow buffer. Ignored if buffer_seconds is given.
+            fill_gaps (str, optional): In background mode, how samples of dropped packets are filled: None (not filled),
+                'nan' or 'interpolate'. See start_acquisition(). Default is None.
+
         Raises:
             BrainFlowError: If the board fails to prepare the session or start streaming.
         """
         if self.serial_port is None and self.master_board is None:
             print("No serial port provided, attempting to auto-detect...")
-            ports_info = self.find_device_ports()
+            ports_info = self.find_device_ports(parallel=True, max_devices=1, prefilter='rank', use_cache=True)
             self.serial_port = ports_info[0]['port'] if ports_info else None
             if not self.serial_port:
                 print("No compatible device found. Setup failed.")
@@ -172,16 +995,589 @@ class BrainFlowBoardSetup:
             self.serial_port = '' 
         
         self.params.serial_port = self.serial_port
+        self.native_buffer_size = self._native_buffer_size(buffer_seconds, buffer_bytes)
         self.board = BoardShim(self.board_id, self.params)
         try:
             self.board.prepare_session()
             self.session_prepared = True
-            self.board.start_stream(450000)
+            self.board.start_stream(self.native_buffer_size)
             self.streaming = True
             print(f"[{self.name}, {self.serial_port}] Board setup and streaming started successfully.")
         except BrainFlowError as e:
             print(f"[{self.name}, {self.serial_port}] Error setting up board: {e}")
             self.board = None
+            return
+
+        if background:
+            self.start_acquisition(poll_interval=poll_interval, history_seconds=history_seconds, stall_timeout=stall_timeout, fill_gaps=fill_gaps)
+
+    def _native_buffer_size(self, buffer_seconds=None, buffer_bytes=None):
+        """
+        Computes the number of samples to request from BoardShim.start_stream().
+
+        Args:
+            buffer_seconds (float, optional): Seconds of data the buffer must hold.
+            buffer_bytes (int, optional): Memory budget for the buffer, in bytes. Ignored if buffer_seconds is given.
+
+        Returns:
+            int: The buffer size in samples (DEFAULT_NATIVE_BUFFER_SIZE if neither argument is given).
+        """
+        if buffer_seconds is not None:
+            return max(1, int(buffer_seconds * (self.sampling_rate or 250)))
+        if buffer_bytes is not None:
+            return max(1, int(buffer_bytes // (self._num_rows() * np.dtype(np.float64).itemsize)))
+        return DEFAULT_NATIVE_BUFFER_SIZE
+
+    def _board_to_use(self):
+        """
+        Returns the board ID whose descriptor applies to this instance: the master board if provided, the board otherwise.
+        """
+        return self.master_board if self.master_board is not None else self.board_id
+
+    def _num_rows(self):
+        """
+        Returns the number of rows in a packet of this board (or of its master board).
+        """
+        return BoardShim.get_num_rows(self._board_to_use())
+
+    def get_num_channels(self):
+        """
+        Retrieves the number of rows kept by the buffer and returned by data requests in background mode.
+
+        Returns:
+            int: The size of the channel selection, or the number of rows of a board packet if no selection was declared.
+        """
+        return len(self.channel_rows) if self.channel_rows is not None else self._num_rows()
+
+    def _stored_rows(self, channels):
+        """
+        Translates board data rows into rows of the buffer, which only holds channel_rows when a selection was declared.
+
+        Args:
+            channels (slice | list | int | None): Board data rows. None selects every buffered row.
+
+        Returns:
+            slice | list | int: The equivalent selection of buffer rows.
+
+        Raises:
+            ValueError: If a requested row is not part of the channel selection.
+        """
+        if self.channel_rows is None or channels is None:
+            return _as_row_slice(channels)
+        if isinstance(channels, slice):
+            channels = range(*channels.indices(self._num_rows()))
+        single = isinstance(channels, (int, np.integer))
+        rows = [channels] if single else channels
+        missing = [row for row in rows if row not in self._row_positions]
+        if missing:
+            raise ValueError(f"[{self.name}] Rows {missing} are not part of the channel selection {self.channel_rows}.")
+        positions = [self._row_positions[row] for row in rows]
+        return positions[0] if single else _as_row_slice(positions)
+
+    def get_memory_footprint(self):
+        """
+        Reports the memory used by the sample buffers of this board.
+
+        Returns:
+            dict: 'native_buffer_bytes' (the BrainFlow buffer requested by start_stream(), allocated in native memory),
+                'ring_buffer_bytes' (the background acquisition buffer) and 'total_bytes'.
+        """
+        native = (self.native_buffer_size or 0) * self._num_rows() * np.dtype(np.float64).itemsize if self.board is not None else 0
+        ring = self.buffer.data.nbytes if self.buffer is not None else 0
+        return {'native_buffer_bytes': native, 'ring_buffer_bytes': ring, 'total_bytes': native + ring}
+
+    def start_acquisition(self, poll_interval=0.02, history_seconds=60, stall_timeout=None, min_rate_fraction=0.5, fill_gaps=None):
+        """
+        Starts the background thread that drains the BoardShim into this instance's buffer at a fixed cadence.
+
+        If stall_timeout is set, the thread also acts as a watchdog: when fewer than min_rate_fraction * sampling_rate
+        samples per second arrived over the last stall_timeout seconds (e.g. the dongle dropped), it re-runs
+        prepare_session()/start_stream() on the same port. The buffer and latest_sample_index carry on across the
+        reconnect, and the gap is recorded; see get_stream_health().
+
+        Every drained chunk is also checked for dropped packets using the package number channel; see
+        get_packet_loss_stats(). With fill_gaps set, the samples of dropped packets are inserted back into the stream
+        (as NaN or interpolated values), so a window of N samples always spans N sample periods.
+
+        Args:
+            poll_interval (float): Seconds between two drains of the BoardShim. Default is 0.02.
+            history_seconds (float): Seconds of history kept in the buffer. Default is 60.
+            stall_timeout (float, optional): Seconds of low sample arrival rate after which the board is reconnected. Default is None (no watchdog).
+            min_rate_fraction (float): Fraction of the sampling rate below which the stream is considered stalled. Default is 0.5.
+            fill_gaps (str, optional): None to only count dropped packets, 'nan' or 'interpolate' to fill them. Default is None.
+        """
+        if self.board is None or not self.streaming:
+            print("Board is not streaming, cannot start background acquisition.")
+            return
+        if self._acquisition_thread is not None and self._acquisition_thread.is_alive():
+            return
+
+        self.poll_interval = poll_interval
+        self.stall_timeout = stall_timeout
+        self.min_rate_fraction = min_rate_fraction
+        self._arrivals.clear()
+        self._last_arrival = self._watch_start = time.monotonic()
+        self._allocate_buffers(history_seconds, fill_gaps)
+        self._stop_acquisition.clear()
+        self.background = True
+        self._acquisition_thread = threading.Thread(target=self._acquisition_loop, name=f"{self.name} acquisition", daemon=True)
+        self._acquisition_thread.start()
+
+    def start_replay(self, file_path, speed=1.0, chunk_size=None, history_seconds=60, fill_gaps=None):
+        """
+        Replays a recorded session through the same buffer, callbacks and consumer API as background acquisition.
+
+        The file is cut into chunks of exactly chunk_size samples which are fed to the buffer at speed times real time,
+        or as fast as possible if speed is None, so pipelines (e.g. process_eeg_beta or the game's scoring) can be
+        benchmarked on real data and field issues reproduced offline. Chunking is deterministic: every replay of the
+        same file with the same chunk_size produces the same sequence of chunks.
+
+        The instance should be created with board_id=BoardIds.PLAYBACK_FILE_BOARD.value and master_board set to the
+        board that made the recording, so channel layout and sampling rate match. No native session is opened.
+        Recordings of a channel selection are scattered back into full packets at their original rows; the rows
+        that were not recorded replay as 0 (no marker, a constant package number).
+
+        Args:
+            file_path (str): A .npy file written by SessionRecorder, or a file written by BrainFlow's DataFilter.write_file.
+            speed (float, optional): Playback speed relative to real time (1.0, 10.0, ...). None replays as fast as possible. Default is 1.0.
+            chunk_size (int, optional): Samples per chunk. Defaults to the number of samples per 20 ms.
+            history_seconds (float): Seconds of history kept in the buffer. Default is 60.
+            fill_gaps (str, optional): None to only count dropped packets, 'nan' or 'interpolate' to fill them. Default is None.
+        """
+        if self.background:
+            print("Board is already streaming in background mode, cannot start a replay.")
+            return
+        timestamp_origin = None
+        recorded_rows = None
+        if file_path.endswith('.npy'):
+            from session_recorder import load_session
+
+            data, metadata = load_session(file_path)
+            # Recordings made with a float32 board store timestamps relative to the board's timestamp_origin
+            timestamp_origin = metadata.get('timestamp_origin')
+            recorded_rows = metadata.get('channel_rows')
+        else:
+            data = DataFilter.read_file(file_path)
+        sampling_rate = self.sampling_rate or 250
+        chunk_size = int(chunk_size or max(1, round(0.02 * sampling_rate)))
+
+        num_rows = self._num_rows()
+        if recorded_rows is not None and list(recorded_rows) == list(range(num_rows)):
+            recorded_rows = None
+        if recorded_rows is not None:
+            if len(recorded_rows) != data.shape[0] or not all(0 <= row < num_rows for row in recorded_rows):
+                print(f"[{self.name}] {file_path} does not match its recorded rows {recorded_rows}, cannot replay it.")
+                return
+            missing = [row for row in (self.channel_rows or []) if row not in recorded_rows]
+            if missing:
+                print(f"[{self.name}] Rows {missing} were not recorded in {file_path}, they replay as 0.")
+        elif data.shape[0] != num_rows:
+            print(f"[{self.name}] {file_path} has {data.shape[0]} rows but board packets have {num_rows}, cannot replay it.")
+            return
+
+        self.poll_interval = chunk_size / sampling_rate
+        self.stall_timeout = None
+        self._allocate_buffers(history_seconds, fill_gaps)
+        self.replay_finished.clear()
+        self._stop_acquisition.clear()
+        self.background = self.streaming = True
+        self._acquisition_thread = threading.Thread(target=self._replay_loop, args=(data, speed, chunk_size, timestamp_origin, recorded_rows), name=f"{self.name} replay", daemon=True)
+        self._acquisition_thread.start()
+        print(f"[{self.name}] Replaying {file_path} ({data.shape[1]} samples) at {f'{speed}x' if speed else 'maximum'} speed.")
+
+    def _allocate_buffers(self, history_seconds, fill_gaps=None):
+        """
+        Looks up the timestamp and marker rows and allocates the ring buffers and the packet gap detector (kept if
+        already allocated, so statistics carry on across restarts).
+
+        Args:
+            history_seconds (float): Seconds of history kept in the buffers.
+            fill_gaps (str, optional): Fill mode of the packet gap detector. Default is None.
+        """
+        board_descr = BoardShim.get_board_descr(self._board_to_use())
+        self._timestamp_row = board_descr['timestamp_channel']
+        self._marker_row = board_descr['marker_channel']
+        self._stored_timestamp_row = self._timestamp_row if self.channel_rows is None else self._row_positions.get(self._timestamp_row)
+        if self.packet_gaps is None and 'package_num_channel' in board_descr:
+            self.packet_gaps = PacketGapDetector(board_descr['package_num_channel'], fill=fill_gaps,
+                                                 timestamp_row=self._timestamp_row, marker_row=self._marker_row)
+        elif self.packet_gaps is not None:
+            self.packet_gaps.fill = fill_gaps
+            self.packet_gaps.restart_sequence()
+        capacity = int(history_seconds * (self.sampling_rate or 250))
+        with self.data_condition:
+            if self.buffer is None:
+                num_rows = len(self.channel_rows) if self.channel_rows is not None else self._num_rows()
+                self.buffer = RingBuffer(num_rows, capacity, dtype=self.dtype)
+                # Timestamps are always kept in float64, whatever the channel selection and dtype, for alignment and time-based lookups
+                self._timestamps = RingBuffer(1, capacity)
+                self._read_index = self.latest_sample_index = self.buffer.total_written
+
+    def _replay_loop(self, data, speed, chunk_size, timestamp_origin=None, recorded_rows=None):
+        """
+        Body of the replay thread: feeds fixed-size chunks of the recording to _ingest() at the requested pace,
+        scattering the recorded_rows of a channel selection recording into full packets.
+        """
+        num_rows = self._num_rows()
+        sampling_rate = self.sampling_rate or 250
+        start = time.perf_counter()
+        for offset in range(0, data.shape[1], chunk_size):
+            if speed:
+                # Pace on the cumulative schedule, not per chunk, so timing errors do not accumulate
+                delay = start + (offset + chunk_size) / (sampling_rate * speed) - time.perf_counter()
+                if delay > 0 and self._stop_acquisition.wait(delay):
+                    break
+            elif self._stop_acquisition.is_set():
+                break
+            if recorded_rows is None:
+                chunk = np.array(data[:, offset:offset + chunk_size], dtype=np.float64)
+            else:
+                chunk = np.zeros((num_rows, min(chunk_size, data.shape[1] - offset)))
+                chunk[recorded_rows] = data[:, offset:offset + chunk_size]
+            if timestamp_origin is not None:
+                chunk[self._timestamp_row] += timestamp_origin
+            self._ingest(chunk)
+
+        self.replay_seconds = time.perf_counter() - start
+        self.background = self.streaming = False
+        with self.data_condition:
+            self.data_condition.notify_all()
+            self._wake_async_waiters(force=True)
+        self.replay_finished.set()
+
+    def wait_for_replay(self, timeout=None):
+        """
+        Blocks until the replay started by start_replay() has fed its last chunk.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Default is None (wait forever).
+
+        Returns:
+            bool: True if the replay finished, False if the wait timed out.
+        """
+        return self.replay_finished.wait(timeout)
+
+    def _serving_from_buffer(self):
+        """
+        Returns True if data requests are answered from the ring buffer: in background mode, and after a replay
+        (or background acquisition) when no board session remains to read from.
+        """
+        return self.background or (self.buffer is not None and self.board is None)
+
+    def stop_acquisition(self):
+        """
+        Stops the background acquisition thread, if running. Buffered data remains available through the buffer attribute.
+        """
+        self._stop_acquisition.set()
+        if self._acquisition_thread is not None:
+            self._acquisition_thread.join(timeout=max(1.0, 5 * (self.poll_interval or 0)))
+            self._acquisition_thread = None
+        self.background = False
+        with self.data_condition:
+            self.data_condition.notify_all()
+            self._wake_async_waiters(force=True)
+
+    def _acquisition_loop(self):
+        """
+        Body of the background acquisition thread: drains the BoardShim and hands each chunk to _ingest().
+        """
+        while not self._stop_acquisition.is_set():
+            chunk = None
+            # After a failed reconnect the session is released: keep markers pending and only let the watchdog retry
+            if self.streaming:
+                self.markers.flush(self.board, self.name, verbose=self._verbose_markers)
+                try:
+                    chunk = self.board.get_board_data()
+                except BrainFlowError as e:
+                    print(f"[{self.name}, {self.serial_port}] Error draining board: {e}")
+            if chunk is not None and chunk.shape[1] > 0:
+                self._ingest(chunk)
+            if self.stall_timeout is not None:
+                self._check_stall(chunk.shape[1] if chunk is not None else 0)
+            self._stop_acquisition.wait(self.poll_interval)
+
+    def _check_stall(self, num_new):
+        """
+        Watchdog step run after each drain: tracks the sample arrival rate and reconnects the board if it stalled.
+
+        Args:
+            num_new (int): Number of samples the last drain returned.
+        """
+        now = time.monotonic()
+        if num_new:
+            if self.gaps and self.gaps[-1]['duration'] is None:
+                # First samples after a reconnect: close the open gap
+                self.gaps[-1]['duration'] = now - self._last_arrival
+                print(f"[{self.name}, {self.serial_port}] Stream resumed after {self.gaps[-1]['duration']:.2f} s.")
+            self._last_arrival = now
+            self._arrivals.append((now, num_new))
+        while self._arrivals and self._arrivals[0][0] < now - self.stall_timeout:
+            self._arrivals.popleft()
+
+        if now - self._watch_start < self.stall_timeout:
+            return  # not watched long enough to judge the rate
+        expected = self.min_rate_fraction * (self.sampling_rate or 250) * self.stall_timeout
+        if sum(n for _, n in self._arrivals) < expected:
+            self._reconnect()
+            self._watch_start = time.monotonic()
+
+    def _reconnect(self):
+        """
+        Releases the stalled session and re-runs prepare_session()/start_stream() on the same port.
+        The buffer is left untouched; the gap is appended to gaps and closed when samples arrive again.
+        """
+        if not self.gaps or self.gaps[-1]['duration'] is not None:
+            self.gaps.append({'sample_index': self.latest_sample_index, 'start_time': time.time() - (time.monotonic() - self._last_arrival), 'duration': None})
+        print(f"[{self.name}, {self.serial_port}] Stream stalled, reconnecting...")
+
+        for release in (self.board.stop_stream, self.board.release_session):
+            try:
+                release()
+            except BrainFlowError:
+                pass
+        self.streaming = self.session_prepared = False
+
+        try:
+            # Reuse the same BoardShim: sessions are keyed by board ID and params, so a discarded instance would
+            # release the new session when garbage collected
+            self.board.prepare_session()
+            self.session_prepared = True
+            self.board.start_stream(self.native_buffer_size)
+            self.streaming = True
+            self.reconnect_count += 1
+            if self.packet_gaps is not None:
+                self.packet_gaps.restart_sequence()  # the new session restarts the package counter
+            print(f"[{self.name}, {self.serial_port}] Reconnected ({self.reconnect_count} reconnect(s) so far).")
+        except BrainFlowError as e:
+            print(f"[{self.name}, {self.serial_port}] Reconnect failed, retrying in {self.stall_timeout} s: {e}")
+
+    def get_stream_health(self):
+        """
+        Reports the watchdog statistics for this session.
+
+        Returns:
+            dict: 'reconnect_count', 'gaps' (list of dictionaries with the 'sample_index' at which the gap occurred, its
+                wall-clock 'start_time' and 'duration' in seconds, None while still open), 'total_gap_seconds' and
+                'arrival_rate' (samples per second over the last stall_timeout seconds, None if the watchdog is off).
+        """
+        arrival_rate = None
+        if self.stall_timeout:
+            arrival_rate = sum(n for _, n in list(self._arrivals)) / self.stall_timeout
+        return {
+            'reconnect_count': self.reconnect_count,
+            'gaps': [dict(gap) for gap in self.gaps],
+            'total_gap_seconds': sum(gap['duration'] for gap in self.gaps if gap['duration'] is not None),
+            'arrival_rate': arrival_rate,
+        }
+
+    def get_packet_loss_stats(self):
+        """
+        Reports the packets dropped between the board and this instance, detected from the package number channel
+        of every chunk drained in background mode (or replayed).
+
+        Returns:
+            dict: See PacketGapDetector.get_stats(). All counts are 0 before background acquisition starts.
+        """
+        if self.packet_gaps is None:
+            return {'received': 0, 'lost': 0, 'loss_ratio': 0.0, 'gap_events': 0, 'largest_gap': 0, 'filled': 0}
+        return self.packet_gaps.get_stats()
+
+    def _ingest(self, chunk):
+        """
+        Writes a drained chunk into the ring buffer and wakes up waiters.
+
+        Args:
+            chunk (numpy.ndarray): A (rows x samples) array as returned by BoardShim.get_board_data().
+        """
+        if self.packet_gaps is not None:
+            chunk = self.packet_gaps.process(chunk)
+        self.markers.map_chunk(self.latest_sample_index, chunk[self._timestamp_row], chunk[self._marker_row])
+        selected = chunk if self._row_selection is None else chunk[self._row_selection]
+        if selected.dtype != self.dtype:
+            selected = self._to_storage_dtype(selected)
+        with self.data_condition:
+            self.buffer.write(selected)
+            self._timestamps.write(chunk[self._timestamp_row:self._timestamp_row + 1])
+            self.latest_sample_index = self.buffer.total_written
+            self.data_condition.notify_all()
+            self._wake_async_waiters()
+
+        for callback in list(self._data_callbacks):
+            try:
+                callback(selected)
+            except Exception as e:
+                print(f"[{self.name}] Error in data callback {callback}: {e}")
+
+    def _to_storage_dtype(self, selected):
+        """
+        Converts the selected rows of a chunk to the storage dtype, storing timestamps relative to timestamp_origin.
+        """
+        converted, self.timestamp_origin = _convert_samples(selected, self.dtype, self._stored_timestamp_row, self.timestamp_origin)
+        return converted
+
+    def add_data_callback(self, callback):
+        """
+        Registers a function called from the background thread with every drained (rows x samples) chunk,
+        restricted to channel_rows if a channel selection was declared.
+        Callbacks run on the acquisition thread and should return quickly.
+
+        Args:
+            callback (callable): Function taking the chunk (numpy.ndarray) as its only argument.
+        """
+        if callback not in self._data_callbacks:
+            self._data_callbacks.append(callback)
+
+    def remove_data_callback(self, callback):
+        """
+        Unregisters a function previously passed to add_data_callback(). Does nothing if it is not registered.
+
+        Args:
+            callback (callable): The function to remove.
+        """
+        if callback in self._data_callbacks:
+            self._data_callbacks.remove(callback)
+
+    def serve_stream(self, address=None, queue_size=64, dtype=None):
+        """
+        Starts a StreamServer that sends every drained chunk to local clients over TCP or a Unix socket (background mode only).
+
+        Args:
+            address (tuple | str, optional): (host, port) or Unix socket path to listen on. Defaults to stream_server.DEFAULT_SERVER_ADDRESS.
+            queue_size (int, optional): Maximum number of chunks queued per client before the oldest are dropped. Default is 64.
+            dtype (numpy.dtype, optional): Data type of the samples sent (float64 or float32). Defaults to the board's dtype.
+
+        Returns:
+            StreamServer: The running server (call stop() on it to close it), or None if the board is not streaming in background mode.
+        """
+        from stream_server import DEFAULT_SERVER_ADDRESS, StreamServer
+
+        if not self.background:
+            print("Board is not streaming in background mode, cannot serve its stream.")
+            return None
+        server = StreamServer(self, address or DEFAULT_SERVER_ADDRESS, queue_size=queue_size, dtype=dtype)
+        server.start()
+        return server
+
+    def wait_for_samples(self, index=None, timeout=None):
+        """
+        Blocks until the background thread has drained samples past the given index.
+
+        Args:
+            index (int, optional): Sample index to wait past. Defaults to the current latest_sample_index, i.e. wait for the next chunk.
+            timeout (float, optional): Maximum number of seconds to wait. Default is None (wait forever).
+
+        Returns:
+            int: The latest_sample_index after waking up (unchanged if the wait timed out).
+        """
+        with self.data_condition:
+            if index is None:
+                index = self.latest_sample_index
+            self.data_condition.wait_for(lambda: self.latest_sample_index > index or not self.background, timeout=timeout)
+            return self.latest_sample_index
+
+    def _wake_async_waiters(self, force=False):
+        """
+        Resolves the futures of wait_for_samples_async() callers whose index has been passed, on their own event loops.
+        Must be called while holding data_condition.
+
+        Args:
+            force (bool): Whether to resolve every waiter regardless of its index (used when acquisition stops).
+        """
+        remaining = []
+        for loop, future, index in self._async_waiters:
+            if future.done():
+                continue  # cancelled by its caller
+            if force or self.latest_sample_index > index:
+                try:
+                    loop.call_soon_threadsafe(_set_future_result, future, self.latest_sample_index)
+                except RuntimeError:
+                    pass  # the caller's event loop was closed without cancelling its task: drop the waiter
+            else:
+                remaining.append((loop, future, index))
+        self._async_waiters = remaining
+
+    async def wait_for_samples_async(self, index=None):
+        """
+        Awaits until the background thread has drained samples past the given index, without blocking the event loop.
+
+        Args:
+            index (int, optional): Sample index to wait past. Defaults to the current latest_sample_index, i.e. wait for the next chunk.
+
+        Returns:
+            int: The latest_sample_index after waking up.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self.data_condition:
+            if index is None:
+                index = self.latest_sample_index
+            if self.latest_sample_index > index or not self.background:
+                return self.latest_sample_index
+            future = loop.create_future()
+            waiter = (loop, future, index)
+            self._async_waiters.append(waiter)
+        try:
+            return await future
+        finally:
+            with self.data_condition:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+
+    async def window(self, seconds, channels=None):
+        """
+        Awaits until seconds worth of new samples have been drained, then returns the latest window of that length.
+
+        Args:
+            seconds (float): Length of the window in seconds.
+            channels (slice | list, optional): Rows of the board data to return. Defaults to the channel selection (all rows if none was declared).
+
+        Returns:
+            numpy.ndarray: A (rows x samples) copy of the window, shorter if acquisition stopped early.
+            None: If the board is not streaming in background mode.
+        """
+        if not self.background:
+            print("Board is not streaming in background mode, cannot await a window.")
+            return None
+        num_samples = int(seconds * self.sampling_rate)
+        target = self.latest_sample_index + num_samples
+        while self.latest_sample_index < target and self.background:
+            await self.wait_for_samples_async(target - 1)
+        with self.data_condition:
+            return np.array(self.buffer.latest(num_samples, rows=self._stored_rows(channels)))
+
+    async def iter_chunks(self, chunk_size, channels=None):
+        """
+        Asynchronously iterates over consecutive, non-overlapping chunks of exactly chunk_size samples, starting with
+        the samples drained after the call. Stops when background acquisition stops.
+
+        If the consumer falls so far behind that samples leave the buffer, the iteration skips ahead to the oldest
+        buffered sample (and reports it) rather than yielding a short chunk.
+
+        Args:
+            chunk_size (int): Number of samples per chunk.
+            channels (slice | list, optional): Rows of the board data to return. Defaults to the channel selection (all rows if none was declared).
+
+        Yields:
+            numpy.ndarray: A (rows x chunk_size) copy of each chunk.
+        """
+        if not self.background:
+            print("Board is not streaming in background mode, cannot iterate over chunks.")
+            return
+        chunk_size = int(chunk_size)
+        next_index = self.latest_sample_index
+        while self.background:
+            await self.wait_for_samples_async(next_index + chunk_size - 1)
+            with self.data_condition:
+                if next_index < self.buffer.oldest_index:
+                    print(f"[{self.name}] Chunk consumer fell behind, skipping {self.buffer.oldest_index - next_index} samples.")
+                    next_index = self.buffer.oldest_index
+                chunks = []
+                while next_index + chunk_size <= self.latest_sample_index:
+                    chunks.append(np.array(self.buffer.read(next_index, next_index + chunk_size, rows=self._stored_rows(channels))))
+                    next_index += chunk_size
+            for chunk in chunks:
+                yield chunk
 
     def show_params(self):
         """
@@ -223,42 +1619,170 @@ class BrainFlowBoardSetup:
     def get_board_data(self):
         """
         Retrieves all accumulated data from the BrainFlow board and clears it from the buffer.
+        In background mode, returns the samples drained since the previous call (bounded by history_seconds).
 
         Returns:
             numpy.ndarray: The current data from the BrainFlow board if the board is set up.
             None: If the board is not set up.
         """
-        if self.board is not None:
-            return self.board.get_board_data()
+        if self._serving_from_buffer():
+            with self.data_condition:
+                data = np.array(self.buffer.read(self._read_index, self.latest_sample_index))
+                self._read_index = self.latest_sample_index
+            return data
+        elif self.board is not None:
+            return self._select_rows(self.board.get_board_data())
         else:
             print("Board is not set up.")
             return None
 
-    def get_current_board_data(self, num_samples):
+    def get_current_board_data(self, num_samples, channels=None):
         """
         Retrieves the most recent num_samples data from the BrainFlow board without clearing it from the buffer.
+        In background mode, the data is served from this instance's ring buffer without calling into the BoardShim
+        and without copying: the result is a read-only view (or a single copy if the window wraps around).
 
         Args:
             num_samples (int): Number of recent samples to fetch.
+            channels (slice | list, optional): Rows of the board data to return, e.g. slice(1, 9). Defaults to the channel selection
+                (all rows if none was declared).
 
         Returns:
             numpy.ndarray: The latest num_samples data from the BrainFlow board if the board is set up.
             None: If the board is not set up.
         """
-        if self.board is not None:
-            return self.board.get_current_board_data(num_samples)
+        if self._serving_from_buffer():
+            with self.data_condition:
+                return self.buffer.latest(num_samples, rows=self._stored_rows(channels))
+        elif self.board is not None:
+            data = self.board.get_current_board_data(int(num_samples))
+            return self._select_rows(data, channels)
         else:
             print("Board is not set up.")
             return None
 
-    def insert_marker(self, marker, verbose=True):
+    def get_current_window(self, num_samples, channels=None):
+        """
+        Retrieves the most recent num_samples samples together with their timestamps, read under one lock so both
+        come from the same drained chunks (background mode only). Works whatever the channel selection.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch.
+            channels (slice | list, optional): Board data rows to return. Defaults to all buffered rows.
+
+        Returns:
+            tuple: The (rows x samples) data, a read-only view like get_current_board_data(), and the 1D array of timestamps.
+            None: If the board is not streaming in background mode.
+        """
+        if not self._serving_from_buffer():
+            print("Board is not streaming in background mode, cannot read a window.")
+            return None
+        with self.data_condition:
+            return self.buffer.latest(num_samples, rows=self._stored_rows(channels)), self._timestamps.latest(num_samples)[0]
+
+    def get_sample_index(self, timestamp, side='left'):
+        """
+        Finds the buffered sample at a given time by binary search over the timestamp index (background mode only).
+
+        Args:
+            timestamp (float): Time on the BrainFlow timestamp clock (time.time() seconds).
+            side (str): 'left' for the first sample at or after timestamp, 'right' for the first sample after it. Default is 'left'.
+
+        Returns:
+            int: Absolute sample index, clipped to the samples still held (oldest index to latest_sample_index).
+            None: If the board is not streaming in background mode.
+        """
+        if not self._serving_from_buffer():
+            print("Board is not streaming in background mode, cannot look up a timestamp.")
+            return None
+        with self.data_condition:
+            return self._timestamps.searchsorted(timestamp, side=side)
+
+    def get_window(self, t_start, t_end, channels=None, clock_offset=0.0):
+        """
+        Retrieves the buffered samples whose timestamps fall in [t_start, t_end), found by binary search over the
+        timestamp index rather than by sample count (background mode only).
+
+        Times from another clock can be converted with clock_offset, e.g. PsychoPy's globalClock:
+        clock_offset = time.time() - globalClock.getTime(), measured once at the start of the experiment.
+
+        Args:
+            t_start (float): Start of the window (inclusive).
+            t_end (float): End of the window (exclusive).
+            channels (slice | list, optional): Board data rows to return. Defaults to all buffered rows.
+            clock_offset (float, optional): Seconds added to t_start and t_end to bring them onto the BrainFlow timestamp
+                clock (time.time()). Default is 0.0.
+
+        Returns:
+            tuple: The (rows x samples) data, a read-only view like get_current_board_data(), and the 1D array of
+                timestamps. Only the part of the range still held by the buffer is returned.
+            None: If the board is not streaming in background mode.
+        """
+        if not self._serving_from_buffer():
+            print("Board is not streaming in background mode, cannot read a window.")
+            return None
+        with self.data_condition:
+            start = self._timestamps.searchsorted(t_start + clock_offset)
+            stop = self._timestamps.searchsorted(t_end + clock_offset)
+            return self.buffer.read(start, stop, rows=self._stored_rows(channels)), self._timestamps.read(start, stop)[0]
+
+    def get_marker_window(self, marker, before, after, channels=None):
+        """
+        Retrieves the buffered samples from before seconds before a marker to after seconds after it (background mode only).
+
+        Args:
+            marker (dict | int): A marker event from insert_marker(queued=True) or get_marker_events() (its placed sample,
+                or the sample it was mapped to by time if it has not been placed yet), or an absolute sample index.
+            before (float): Seconds of data before the marker.
+            after (float): Seconds of data after the marker.
+            channels (slice | list, optional): Board data rows to return. Defaults to all buffered rows.
+
+        Returns:
+            tuple: The (rows x samples) data and the 1D array of timestamps, see get_window().
+            None: If the board is not streaming in background mode, or the marker's sample is unknown or no longer buffered.
+        """
+        if not self._serving_from_buffer():
+            print("Board is not streaming in background mode, cannot read a window.")
+            return None
+        index = marker
+        if isinstance(marker, dict):
+            index = marker['placed_index'] if marker['placed_index'] is not None else marker['sample_index']
+        with self.data_condition:
+            if index is None or not self._timestamps.oldest_index <= index < self._timestamps.total_written:
+                print(f"[{self.name}] Marker sample is not in the buffer, cannot read a window around it.")
+                return None
+            t_marker = self._timestamps.read(index, index + 1)[0, 0]
+        return self.get_window(t_marker - before, t_marker + after, channels=channels)
+
+    def _select_rows(self, data, channels=None):
+        """
+        Restricts full board data returned by the BoardShim to the requested rows, or to the channel selection.
+        """
+        if channels is not None:
+            return data[_as_row_slice(channels)]
+        return data if self._row_selection is None else data[self._row_selection]
+
+    def insert_marker(self, marker, verbose=True, queued=False):
         """
         Inserts a marker into the data stream at the current time. Useful for tagging events in the data stream.
 
+        With queued=True (background mode only), the marker is timestamped with time.monotonic() and handed to the
+        MarkerQueue in the markers attribute; the background thread inserts queued markers in batches before each drain,
+        so the caller (e.g. the PsychoPy render loop) does no native call and no console I/O. See get_marker_events()
+        for the sample index each marker maps to.
+
         Args:
             marker (float): The marker value to be inserted.
-            verbose (bool): Whether to print a confirmation message. Default is True.
+            verbose (bool): Whether to print a confirmation message. Default is True. Queued markers are reported from the
+                background thread instead.
+            queued (bool): Whether to queue the marker for the background thread. Default is False.
+
+        Returns:
+            dict: The marker's event entry if it was queued, None otherwise.
         """
+        if queued and self.background:
+            self._verbose_markers = verbose
+            return self.markers.put(marker)
         if self.board is not None and self.streaming:
             try:
                 self.board.insert_marker(marker)
@@ -269,6 +1793,15 @@ class BrainFlowBoardSetup:
         else:
             print("Board is not streaming, cannot insert marker.")
 
+    def get_marker_events(self):
+        """
+        Retrieves the log of markers inserted with insert_marker(queued=True).
+
+        Returns:
+            list: Copies of the MarkerQueue event dictionaries, see MarkerQueue.
+        """
+        return [dict(event) for event in self.markers.events]
+
     def stop(self):
         """
         Stops the data stream and releases the session of the BrainFlow board.
@@ -276,6 +1809,8 @@ class BrainFlowBoardSetup:
         This method safely stops the data stream and releases any resources used by the BrainFlow board.
         It also resets the streaming and session flags.
         """
+        if self.__dict__.get('_acquisition_thread') is not None:
+            self.stop_acquisition()
         try:
             if hasattr(self, 'board') and self.board is not None:
                 if self.streaming:
@@ -322,6 +1857,16 @@ if __name__ == "__main__":
     brainflow_board.stop()
 
 
+############
+# Example replaying a recorded session as fast as possible (e.g. to benchmark a processing pipeline)
+###########
+# if __name__ == "__main__":
+#     replay_board = BrainFlowBoardSetup(board_id=BoardIds.PLAYBACK_FILE_BOARD.value, master_board=BoardIds.CYTON_BOARD.value)
+#     replay_board.start_replay("session.npy", speed=None, chunk_size=125)
+#     replay_board.wait_for_replay()
+#     print(f"Replayed {replay_board.latest_sample_index} samples in {replay_board.replay_seconds:.2f} s")
+
+
 ############
 # Example streaming from two boards simultaneously
 ###########
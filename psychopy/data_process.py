@@ -1,9 +1,10 @@
-import scipy
+import collections
+import threading
 import numpy as np
-import matplotlib.pyplot as plt
 import time
-import mne
-from scipy.signal import butter, lfilter
+
+# MNE, SciPy and matplotlib are imported inside the functions that use them, so importing this module (e.g. from
+# the game) stays fast; the first call pays the import instead. See import_budget.py.
 
 import brainflow
 from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
@@ -30,53 +31,533 @@ from brainflow_stream import BrainFlowBoardSetup
 # DM01HOSQA
 ################################
 
-# Function to create a bandpass filter for beta waves (13-30 Hz)
 
+class DSPPlanCache:
+    """
+    A bounded, thread-safe cache of DSP "plans": everything a feature function derives from its parameters rather
+    than from the data (filter coefficients, window arrays, rfft frequency vectors, band bin indices, MNE Info
+    objects), so steady-state windows do no redesign work.
+
+    Plans are keyed by kind and by the parameters they depend on (sampling rate, window length, band spec, ...);
+    the least recently used plan is evicted once max_entries plans are held. Plans are shared between callers and
+    must not be modified.
+
+    Attributes:
+        max_entries (int): Maximum number of plans held.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that built a new plan.
+    """
+
+    def __init__(self, max_entries=128):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of plans held. Default is 128.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._plans = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, key, build):
+        """
+        Returns the plan of the given kind and key, building and storing it on a miss.
+
+        Args:
+            kind (str): Kind of plan, e.g. 'sos' or 'window'.
+            key (tuple): Hashable parameters the plan depends on.
+            build (callable): Function without arguments that builds the plan.
+
+        Returns:
+            object: The cached plan.
+        """
+        full_key = (kind,) + tuple(key)
+        with self._lock:
+            if full_key in self._plans:
+                self._plans.move_to_end(full_key)
+                self.hits += 1
+                return self._plans[full_key]
+        plan = build()
+        with self._lock:
+            self.misses += 1
+            self._plans[full_key] = plan
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def get_stats(self):
+        """
+        Reports the cache counters.
+
+        Returns:
+            dict: 'hits', 'misses', 'hit_ratio', 'entries', 'max_entries' and 'entries_by_kind'.
+        """
+        with self._lock:
+            kinds = collections.Counter(key[0] for key in self._plans)
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / lookups if lookups else 0.0,
+                    'entries': len(self._plans), 'max_entries': self.max_entries, 'entries_by_kind': dict(kinds)}
+
+    def clear(self):
+        """
+        Drops every plan and resets the counters.
+        """
+        with self._lock:
+            self._plans.clear()
+            self.hits = self.misses = 0
+
+
+# Plan cache shared by every feature function in this module
+PLAN_CACHE = DSPPlanCache()
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+# Function to create a bandpass filter for beta waves (13-30 Hz)
+# Stateless: every call starts from zero filter state. Use StreamingFilterBank to filter a continuous stream.
 def bandpass_filter(data, lowcut=13, highcut=30, fs=250, order=4):
-    nyquist = 0.5 * fs
-    low = lowcut / nyquist
-    high = highcut / nyquist
-    b, a = butter(order, [low, high], btype='band')
-    y = lfilter(b, a, data)
+    from scipy.signal import sosfilt
+
+    y = sosfilt(design_bandpass_sos(lowcut, highcut, fs, order), data)
+    if np.asarray(data).dtype == np.float32:
+        y = y.astype(np.float32)  # keep float32 windows in float32
 
     return y
 
-def remove_dc_offset(data):
-    return data[1:9, :] - np.mean(data[1:9, :], axis=1, keepdims=True)
+# Butterworth band-pass as second-order sections, designed once per (lowcut, highcut, fs, order) through PLAN_CACHE.
+# The returned array is shared between callers and must not be modified (sosfilt needs it writable).
+def design_bandpass_sos(lowcut, highcut, fs=250, order=4):
+    from scipy.signal import butter
+
+    return PLAN_CACHE.get('sos', (lowcut, highcut, fs, order), lambda: butter(order, [lowcut, highcut], btype='band', fs=fs, output='sos'))
+
+
+class StreamingFilterBank:
+    """
+    Band-pass filters a continuous multi-channel stream chunk by chunk, carrying the filter state of every band
+    and channel across chunks.
+
+    Each call only filters the newly arrived samples, so continuous filtering costs O(new samples) instead of
+    O(window), and short windows cut from the output have no start-up transient. Typical use is as a data callback
+    of a background board, or on the chunks of BrainFlowBoardSetup.iter_chunks().
+
+    Attributes:
+        bands (dict): (lowcut, highcut) in Hz keyed by band name, e.g. {'alpha': (8, 13), 'beta': (13, 30)}.
+        fs (float): Sampling rate in Hz.
+        order (int): Butterworth order of every band.
+        samples_processed (int): Number of samples filtered since the last reset.
+    """
+
+    def __init__(self, bands, fs=250, order=4):
+        """
+        Designs the filter of every band (cached across instances).
+
+        Args:
+            bands (dict): (lowcut, highcut) in Hz keyed by band name.
+            fs (float, optional): Sampling rate in Hz. Default is 250.
+            order (int, optional): Butterworth order. Default is 4.
+        """
+        self.bands = dict(bands)
+        self.fs = fs
+        self.order = order
+        self._sos = [design_bandpass_sos(low, high, fs, order) for low, high in self.bands.values()]
+        self._zi = None
+        self.samples_processed = 0
+
+    @property
+    def band_names(self):
+        return list(self.bands)
+
+    def reset(self):
+        """
+        Forgets the filter state, e.g. after a gap in the stream. The next chunk starts the filters again.
+        """
+        self._zi = None
+        self.samples_processed = 0
+
+    def process(self, chunk):
+        """
+        Filters newly arrived samples through every band.
+
+        The first chunk after creation or reset() initializes each filter to its steady state for that chunk's first
+        sample, so the DC offset of raw EEG does not ring through the output.
+
+        Args:
+            chunk (numpy.ndarray): A (channels x samples) array of new samples, or a 1D array for a single channel.
+
+        Returns:
+            numpy.ndarray: A (bands x channels x samples) array of filtered samples, in band_names order. float32 input
+                gives float32 output.
+
+        Raises:
+            ValueError: If the number of channels changed since the filter state was initialized.
+        """
+        from scipy.signal import sosfilt, sosfilt_zi
+
+        chunk = np.atleast_2d(chunk)
+        if self._zi is None:
+            self._zi = [sosfilt_zi(sos)[:, None, :] * chunk[None, :, :1] for sos in self._sos]
+        elif self._zi[0].shape[1] != chunk.shape[0]:
+            raise ValueError(f"Expected chunks with {self._zi[0].shape[1]} channels, got {chunk.shape[0]}.")
+
+        out_dtype = np.float32 if chunk.dtype == np.float32 else np.float64
+        filtered = np.empty((len(self._sos),) + chunk.shape, dtype=out_dtype)
+        for i, sos in enumerate(self._sos):
+            filtered[i], self._zi[i] = sosfilt(sos, chunk, axis=-1, zi=self._zi[i])
+        self.samples_processed += chunk.shape[1]
+        return filtered
+
+
+# Rows defaults to the Cyton EEG rows of a full board packet; pass rows=None for data that only holds EEG channels
+def remove_dc_offset(data, rows=slice(1, 9)):
+    data = data if rows is None else data[rows, :]
+    return data - np.mean(data, axis=1, keepdims=True)
 
 # Function to convert EEG data to an MNE object
 def convert_to_mne(data, sfreq):
-    ch_names = [f'EEG {i+1}' for i in range(data.shape[0])]
-    ch_types = ['eeg'] * data.shape[0]
-    info = mne.create_info(ch_names=ch_names, sfreq=sfreq, ch_types=ch_types)
+    import mne
+
+    # RawArray copies the Info, so one cached Info per (channel count, sfreq) serves every window
+    def build():
+        ch_names = [f'EEG {i+1}' for i in range(data.shape[0])]
+        ch_types = ['eeg'] * data.shape[0]
+        return mne.create_info(ch_names=ch_names, sfreq=sfreq, ch_types=ch_types)
+
+    info = PLAN_CACHE.get('mne_info', (data.shape[0], sfreq), build)
     return mne.io.RawArray(data, info)
 
 
 # Function to compute power spectral density and extract beta waves
 def extract_beta_power(raw):
+    import mne
+
     psd, freqs = mne.time_frequency.psd_array_welch(raw.get_data(), sfreq=raw.info['sfreq'], fmin=13, fmax=30, n_fft=512)
     psd = np.maximum(psd, np.finfo(float).eps)
     psd_db = 10 * np.log10(psd)  # Convert power to dB
     return mne.io.RawArray(psd_db, raw.info)
 
 
+# Periodic Hamming window (scipy.signal.get_window('hamming', n), as used by MNE's Welch), cached per length and dtype
+def _hamming_window(n_per_seg, dtype=np.float64):
+    return PLAN_CACHE.get('window', ('hamming', n_per_seg, np.dtype(dtype).str),
+                          lambda: _read_only((0.54 - 0.46 * np.cos(2 * np.pi * np.arange(n_per_seg) / n_per_seg)).astype(dtype)))
+
+
+# Frequencies of the rfft bins, cached per (n_fft, sfreq)
+def _rfft_freqs(n_fft, sfreq):
+    return PLAN_CACHE.get('rfft_freqs', (n_fft, sfreq), lambda: _read_only(np.arange(n_fft // 2 + 1) * (sfreq / n_fft)))
+
+
+# One-sided PSD density scaling of every rfft bin for a Hamming window of n_per_seg samples: every bin except DC
+# and Nyquist is doubled
+def _density_scale(n_fft, n_per_seg, sfreq):
+    def build():
+        scale = np.full(n_fft // 2 + 1, 2.0 / (sfreq * np.sum(_hamming_window(n_per_seg) ** 2)))
+        scale[0] /= 2
+        if n_fft % 2 == 0:
+            scale[-1] /= 2
+        return _read_only(scale)
+
+    return PLAN_CACHE.get('density_scale', (n_fft, n_per_seg, sfreq), build)
+
+
+# Slice of the rfft bins between fmin and fmax, cached per (n_fft, sfreq, fmin, fmax)
+def _band_bins(n_fft, sfreq, fmin, fmax):
+    def build():
+        freqs = _rfft_freqs(n_fft, sfreq)
+        bins = np.flatnonzero((freqs >= fmin) & (freqs <= fmax))
+        if bins.size == 0:
+            raise ValueError(f"No frequencies found between fmin={fmin} and fmax={fmax}")
+        return slice(bins[0], bins[-1] + 1)
+
+    return PLAN_CACHE.get('band_bins', (n_fft, sfreq, fmin, fmax), build)
+
+
+# Pure-NumPy Welch PSD with the same defaults and numbers as mne.time_frequency.psd_array_welch
+# (Hamming window, constant detrend per segment, density scaling, mean over segments), without MNE objects.
+# data is (channels x samples); returns the (channels x freqs) PSD and the freqs between fmin and fmax.
+# float32 data is transformed in float32.
+def welch_psd(data, sfreq, fmin=0, fmax=np.inf, n_fft=256, n_overlap=0, n_per_seg=None):
+    data = np.asarray(data)
+    dtype = np.float32 if data.dtype == np.float32 else np.float64
+    n_times = data.shape[-1]
+    if n_per_seg is None and n_fft > n_times:
+        raise ValueError(f"n_fft ({n_fft}) cannot be larger than the number of samples ({n_times}) unless n_per_seg is set.")
+    n_per_seg = min(n_fft if n_per_seg is None else n_per_seg, n_fft, n_times)
+    step = max(n_per_seg - n_overlap, 1)
+
+    bins = _band_bins(n_fft, sfreq, fmin, fmax)
+    window = _hamming_window(n_per_seg, dtype)
+    segments = np.lib.stride_tricks.sliding_window_view(data.astype(dtype, copy=False), n_per_seg, axis=-1)[..., ::step, :]
+    segments = (segments - segments.mean(axis=-1, keepdims=True)) * window
+    spectrum = np.fft.rfft(segments, n=n_fft, axis=-1)[..., bins]
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+
+    mean = np.nanmean if np.isnan(power).any() else np.mean
+    return mean(power, axis=-2) * _density_scale(n_fft, n_per_seg, sfreq)[bins].astype(dtype), _rfft_freqs(n_fft, sfreq)[bins]
+
+
+# Same result as extract_beta_power(convert_to_mne(data, sfreq)).get_data(), through welch_psd: beta (13-30 Hz) PSD in dB
+def compute_beta_power_db(data, sfreq, fmin=13, fmax=30, n_fft=512):
+    psd, freqs = welch_psd(data, sfreq, fmin=fmin, fmax=fmax, n_fft=n_fft)
+    psd_db = 10 * np.log10(np.maximum(psd, np.finfo(float).eps))  # Convert power to dB
+    return psd_db.astype(psd.dtype, copy=False), freqs
+
+
+# Classic EEG frequency bands in Hz, [low, high)
+EEG_BANDS = {'delta': (1, 4), 'theta': (4, 8), 'alpha': (8, 13), 'beta': (13, 30), 'gamma': (30, 45)}
+
+
+class MultiBandExtractor:
+    """
+    Computes the power of several frequency bands from a single Welch spectrum per window.
+
+    The rfft bins of each band are found once, at construction, and turned into reduceat indices, so every window
+    costs one welch_psd() call and one numpy.add.reduceat over the bins, whatever the number of bands.
+
+    Attributes:
+        sfreq (float): Sampling rate in Hz.
+        bands (dict): (low, high) in Hz keyed by band name. Each band covers the bins in [low, high).
+        n_fft (int): FFT length (and Welch segment length) in samples.
+        n_overlap (int): Overlap between Welch segments in samples.
+        fmin (float): Lowest band edge in Hz.
+        fmax (float): Highest band edge in Hz.
+    """
+
+    def __init__(self, sfreq, bands=EEG_BANDS, n_fft=512, n_overlap=0):
+        """
+        Precomputes the bin-to-band indices.
+
+        Args:
+            sfreq (float): Sampling rate in Hz.
+            bands (dict, optional): (low, high) in Hz keyed by band name. Bands may overlap. Default is EEG_BANDS.
+            n_fft (int, optional): FFT length in samples; windows must hold at least n_fft samples. Default is 512.
+            n_overlap (int, optional): Overlap between Welch segments in samples. Default is 0.
+        """
+        self.sfreq = sfreq
+        self.bands = dict(bands)
+        self.n_fft = n_fft
+        self.n_overlap = n_overlap
+        self.fmin = min(low for low, _ in self.bands.values())
+        self.fmax = max(high for _, high in self.bands.values())
+        self._bin_width = sfreq / n_fft
+        self._indices, self._empty = PLAN_CACHE.get('band_indices', (n_fft, sfreq, tuple(self.bands.values())), self._band_indices)
+
+    def _band_indices(self):
+        """
+        Builds the reduceat indices of the bands over the bins between fmin and fmax.
+
+        Returns:
+            tuple: Interleaved [start, end) bin indices of every band (reduceat sums bins[start:end] at the even
+                positions; the spectrum gets one padding bin so that end may equal the number of bins), and the mask
+                of bands without any bin.
+        """
+        freqs = _rfft_freqs(self.n_fft, self.sfreq)
+        freqs = freqs[(freqs >= self.fmin) & (freqs <= self.fmax)]
+        edges = [(int(np.searchsorted(freqs, low)), int(np.searchsorted(freqs, high))) for low, high in self.bands.values()]
+        return (_read_only(np.array([index for edge in edges for index in edge])),
+                _read_only(np.array([start >= end for start, end in edges])))
+
+    @property
+    def band_names(self):
+        return list(self.bands)
+
+    def compute(self, data):
+        """
+        Computes the power of every band.
+
+        Args:
+            data (numpy.ndarray): A (channels x samples) window, e.g. with its DC offset removed.
+
+        Returns:
+            numpy.ndarray: A (channels x bands) array of band powers (PSD integrated over the band, in squared data units),
+                in band_names order.
+        """
+        psd, _ = welch_psd(data, self.sfreq, fmin=self.fmin, fmax=self.fmax, n_fft=self.n_fft, n_overlap=self.n_overlap)
+        return self.aggregate(psd)
+
+    def aggregate(self, psd):
+        """
+        Sums an existing spectrum into band powers, e.g. one from IncrementalWelch.get_psd(extractor.fmin, extractor.fmax).
+
+        Args:
+            psd (numpy.ndarray): A (... x freqs) PSD over the n_fft bins between fmin and fmax.
+
+        Returns:
+            numpy.ndarray: A (... x bands) array of band powers, see compute().
+        """
+        padded = np.concatenate((psd, np.zeros(psd.shape[:-1] + (1,), dtype=psd.dtype)), axis=-1)
+        powers = np.add.reduceat(padded, self._indices, axis=-1)[..., ::2]
+        powers[..., self._empty] = 0
+        return powers * self._bin_width
+
+    def ratio(self, powers, numerator, denominator):
+        """
+        Computes a band power ratio, e.g. ratio(powers, 'beta', ['alpha', 'theta']) for beta / (alpha + theta).
+
+        Args:
+            powers (numpy.ndarray): A (... x bands) array returned by compute().
+            numerator (str | list): Band name, or names of the bands summed in the numerator.
+            denominator (str | list): Band name, or names of the bands summed in the denominator.
+
+        Returns:
+            numpy.ndarray: The ratio for every channel.
+        """
+        numerator = [self.band_names.index(band) for band in ([numerator] if isinstance(numerator, str) else numerator)]
+        denominator = [self.band_names.index(band) for band in ([denominator] if isinstance(denominator, str) else denominator)]
+        return powers[..., numerator].sum(axis=-1) / powers[..., denominator].sum(axis=-1)
+
+
+class IncrementalWelch:
+    """
+    A sliding-window Welch PSD that is updated as samples arrive instead of recomputed for every window.
+
+    The stream is cut into segments of n_fft samples every n_fft - n_overlap samples. Each segment's periodogram is
+    computed once, when the segment completes, and kept in a ring holding the segments of one window; the average is
+    maintained as a running sum, so each hop costs the FFTs of the new segments only. get_psd() gives the same numbers
+    as welch_psd() on the latest window_seconds of the stream ending at the last completed segment.
+
+    Attributes:
+        sfreq (float): Sampling rate in Hz.
+        n_fft (int): Segment (and FFT) length in samples.
+        n_overlap (int): Overlap between consecutive segments in samples.
+        num_segments (int): Number of segments averaged, i.e. in one window.
+        segments_computed (int): Number of segment periodograms computed since the last reset.
+    """
+
+    def __init__(self, sfreq, window_seconds=4.0, n_fft=256, n_overlap=192):
+        """
+        Initializes the estimator.
+
+        Args:
+            sfreq (float): Sampling rate in Hz.
+            window_seconds (float, optional): Length of the averaged window in seconds. Default is 4.0.
+            n_fft (int, optional): Segment length in samples. Default is 256.
+            n_overlap (int, optional): Overlap between segments in samples; n_fft - n_overlap is the update hop.
+                Default is 192 (a new estimate every 64 samples, 256 ms at 250 Hz).
+        """
+        self.sfreq = sfreq
+        self.n_fft = n_fft
+        self.n_overlap = n_overlap
+        self._step = max(n_fft - n_overlap, 1)
+        self.num_segments = max(1, 1 + (int(window_seconds * sfreq) - n_fft) // self._step)
+        self._freqs = _rfft_freqs(n_fft, sfreq)
+        self._window = _hamming_window(n_fft)
+        self._scale = _density_scale(n_fft, n_fft, sfreq)
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets every segment, e.g. after a gap in the stream.
+        """
+        self._tail = None  # samples not yet covered by a completed segment (plus the overlap with the next one)
+        self._ring = None  # (num_segments x channels x freqs) periodograms
+        self._sum = None
+        self._valid = None  # number of periodograms without NaN per channel
+        self._count = 0
+        self._next = 0  # ring slot of the next periodogram
+        self._pushes_since_resum = 0
+        self.segments_computed = 0
+
+    @property
+    def ready(self):
+        """
+        bool: True once a full window of segments has been averaged.
+        """
+        return self._count == self.num_segments
+
+    def update(self, chunk):
+        """
+        Adds newly arrived samples, computing the periodograms of the segments they complete.
+
+        Args:
+            chunk (numpy.ndarray): A (channels x samples) array of new samples.
+
+        Returns:
+            int: Number of segments completed by this chunk.
+        """
+        chunk = np.atleast_2d(chunk)
+        self._tail = chunk if self._tail is None else np.concatenate((self._tail, chunk), axis=1)
+        n_times = self._tail.shape[1]
+        if n_times < self.n_fft:
+            return 0
+        num_new = 1 + (n_times - self.n_fft) // self._step
+        first = max(0, num_new - self.num_segments)  # segments that would be evicted right away are skipped
+
+        segments = np.lib.stride_tricks.sliding_window_view(self._tail, self.n_fft, axis=-1)[:, ::self._step][:, first:num_new]
+        segments = (segments - segments.mean(axis=-1, keepdims=True)) * self._window
+        spectrum = np.fft.rfft(segments, axis=-1)
+        periodograms = (spectrum.real ** 2 + spectrum.imag ** 2) * self._scale
+        for periodogram in periodograms.transpose(1, 0, 2):
+            self._push(periodogram)
+
+        self._tail = self._tail[:, num_new * self._step:].copy()
+        self.segments_computed += num_new - first
+        return num_new
+
+    def _push(self, periodogram):
+        """
+        Stores a (channels x freqs) periodogram in the ring and updates the running sum.
+        """
+        if self._ring is None:
+            self._ring = np.zeros((self.num_segments,) + periodogram.shape)
+            self._sum = np.zeros(periodogram.shape)
+            self._nan_segments = 0
+        slot = self._next
+        full = self._count == self.num_segments
+        has_nan = bool(np.isnan(periodogram).any())
+        self._nan_segments += has_nan - (full and bool(np.isnan(self._ring[slot]).any()))
+        self._pushes_since_resum += 1
+        # Re-sum from the ring while filling up, once per window to keep rounding errors from accumulating, and while
+        # segments with NaN (filled packet gaps) are held
+        resum = not full or self._pushes_since_resum >= self.num_segments or self._nan_segments or has_nan
+        if not resum:
+            self._sum += periodogram
+            self._sum -= self._ring[slot]
+        self._ring[slot] = periodogram
+        self._next = (slot + 1) % self.num_segments
+        self._count = min(self._count + 1, self.num_segments)
+        if resum:
+            held = self._ring[:self._count]
+            self._sum = np.nansum(held, axis=0)
+            self._valid = np.sum(~np.isnan(held[..., :1]), axis=0)
+            self._pushes_since_resum = 0
+
+    def get_psd(self, fmin=0, fmax=np.inf):
+        """
+        Returns the current Welch estimate, the mean of the periodograms in the ring.
+
+        Args:
+            fmin (float, optional): Lowest frequency returned, in Hz. Default is 0.
+            fmax (float, optional): Highest frequency returned, in Hz. Default is infinity.
+
+        Returns:
+            tuple: The (channels x freqs) PSD and the freqs, or None if no segment has completed yet.
+        """
+        if self._count == 0:
+            return None
+        bins = (self._freqs >= fmin) & (self._freqs <= fmax)
+        return self._sum[:, bins] / self._valid, self._freqs[bins]
+
+
 def process_eeg_beta (period_time, total_time, cyton_board):
+    import matplotlib.pyplot as plt
+
     period_sum = []
     period_average = []
 
     for i in range(int(total_time / period_time)):
-        period_data = cyton_board.get_current_board_data(num_samples = 250 * period_time)
-        data_eeg = period_data[1:9, :]
-        data_eeg = remove_dc_offset(period_data) # Remove DC offset
+        period_data = cyton_board.get_current_board_data(num_samples = 250 * period_time, channels = cyton_board.eeg_channels) # Only fetch the EEG rows
+        data_eeg = remove_dc_offset(period_data, rows = None) # Remove DC offset
 
-        data_mne = convert_to_mne(data_eeg, 250)
-        beta_power = extract_beta_power(data_mne)
+        power_values, freqs = compute_beta_power_db(data_eeg, 250) # Beta power spectrum (dB) and its frequency bins
 
         print(data_eeg.shape)
-        print(beta_power.get_data().shape)  # Correct way to check shape
-
-        freqs = np.linspace(13, 30, beta_power.get_data().shape[1])  # Generate frequency bins
-        power_values = beta_power.get_data()  # Get power values
+        print(power_values.shape)
 
         period_sum.append(np.sum(power_values))
         period_average.append(np.mean(power_values))
@@ -0,0 +1,86 @@
+import argparse
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+
+# Import-time budget, in milliseconds, of each module of the acquisition stack (measured in a fresh interpreter,
+# including numpy and brainflow). Update a budget only together with the change that justifies it.
+IMPORT_BUDGET_MS = {
+    'brainflow_stream': 250,
+    'board_group': 250,
+    'session_recorder': 250,
+    'shared_stream': 250,
+    'data_process': 250,
+    'acquisition_daemon': 250,
+    'stream_server': 250,
+}
+
+# Heavy packages that importing the modules above must not pull in: they are imported by the features that use them
+DEFERRED_MODULES = ('mne', 'scipy', 'matplotlib', 'serial', 'asyncio')
+
+_MEASURE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(name for name in {deferred!r} if name in sys.modules))
+"""
+
+
+def measure_import(module, repeat=5):
+    """
+    Measures how long importing a module takes, each time in a fresh interpreter so nothing is cached in sys.modules.
+
+    Args:
+        module (str): Name of the module to import (run from this directory).
+        repeat (int): Number of measurements. Default is 5.
+
+    Returns:
+        tuple: The median import time in milliseconds and the list of DEFERRED_MODULES that the import loaded.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _MEASURE.format(module=module, deferred=DEFERRED_MODULES)],
+                                cwd=here, capture_output=True, text=True, check=True).stdout.split()
+        times.append(1000 * float(output[0]))
+    loaded = output[1].split(',') if len(output) > 1 else []
+    return float(np.median(times)), loaded
+
+
+def check_budgets(budgets=IMPORT_BUDGET_MS, repeat=5):
+    """
+    Measures every module in budgets and compares it with its import-time budget.
+
+    Args:
+        budgets (dict): Budget in milliseconds keyed by module name. Default is IMPORT_BUDGET_MS.
+        repeat (int): Number of measurements per module. Default is 5.
+
+    Returns:
+        list: One dictionary per module with 'module', 'ms', 'budget_ms', 'loaded' (deferred packages it imported)
+            and 'ok' (within budget and no deferred package loaded).
+    """
+    results = []
+    for module, budget in budgets.items():
+        ms, loaded = measure_import(module, repeat)
+        results.append({'module': module, 'ms': ms, 'budget_ms': budget, 'loaded': loaded, 'ok': ms <= budget and not loaded})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the import time of the acquisition modules against their budget.")
+    parser.add_argument('--repeat', type=int, default=5, help="Measurements per module (the median is reported).")
+    parser.add_argument('modules', nargs='*', help="Modules to check. Defaults to every module in IMPORT_BUDGET_MS.")
+    args = parser.parse_args()
+
+    budgets = {module: IMPORT_BUDGET_MS.get(module, float('inf')) for module in args.modules} or IMPORT_BUDGET_MS
+    results = check_budgets(budgets, args.repeat)
+
+    print(f"{'module':<18} {'ms':>8} {'budget':>8}  status")
+    for r in results:
+        status = 'ok' if r['ok'] else 'OVER BUDGET' if r['ms'] > r['budget_ms'] else f"loads {', '.join(r['loaded'])}"
+        print(f"{r['module']:<18} {r['ms']:>8.1f} {r['budget_ms']:>8.0f}  {status}")
+    sys.exit(0 if all(r['ok'] for r in results) else 1)
@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import collections
+import os
+import time
+
+import numpy as np
+
+from brainflow.board_shim import BoardShim, BoardIds
+
+from brainflow_stream import BrainFlowBoardSetup
+from data_process import compute_beta_power_db
+
+
+# FFT length of the Welch path in beta_power_feature: analysis windows must hold at least this many samples
+FEATURE_N_FFT = 512
+
+
+def current_rss_bytes():
+    """
+    Returns the resident memory of this process in bytes (peak resident memory if the current value is unavailable).
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource  # POSIX only, Windows relies on psutil above
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def beta_power_feature(window, sampling_rate):
+    """
+    The feature path used by process_eeg_beta: DC offset removal and Welch beta power.
+
+    Args:
+        window (numpy.ndarray): A (EEG channels x samples) window.
+        sampling_rate (int): Sampling rate of the window.
+
+    Returns:
+        numpy.ndarray: Beta power spectrum (dB) per channel.
+    """
+    data_eeg = window - np.mean(window, axis=1, keepdims=True)
+    return compute_beta_power_db(data_eeg, sampling_rate, n_fft=FEATURE_N_FFT)[0]
+
+
+class DrainClock:
+    """
+    Records, from a board's acquisition thread, when each drain made latest_sample_index cross a sample index, so
+    latencies can be measured from the drain rather than from when a consumer coroutine got to run.
+
+    Attributes:
+        board (BrainFlowBoardSetup): The board whose drains are recorded.
+    """
+
+    def __init__(self, board):
+        """
+        Initializes the clock. It records drains while registered as a data callback of the board.
+
+        Args:
+            board (BrainFlowBoardSetup): The board whose drains are recorded.
+        """
+        self.board = board
+        self._drains = collections.deque(maxlen=4096)  # (latest_sample_index after the drain, perf_counter time)
+
+    def __call__(self, chunk):
+        self._drains.append((self.board.latest_sample_index, time.perf_counter()))
+
+    def time_reached(self, index):
+        """
+        Returns the time of the first drain that brought latest_sample_index to at least index. Queries must come in
+        increasing index order: earlier drains are discarded.
+
+        Args:
+            index (int): The sample index.
+
+        Returns:
+            float: The time.perf_counter() value of that drain, or the current time if its callback has not run yet
+                (waiters are woken just before the data callbacks).
+        """
+        while self._drains and self._drains[0][0] < index:
+            self._drains.popleft()
+        return self._drains[0][1] if self._drains else time.perf_counter()
+
+
+async def drive_board(board, drain_clock, window_seconds, hop_seconds, feature, latencies, stop_time):
+    """
+    Computes the feature on the latest window every hop_seconds of new samples until stop_time.
+
+    Args:
+        board (BrainFlowBoardSetup): A board streaming in background mode.
+        drain_clock (DrainClock): Drain times of the board.
+        window_seconds (float): Length of each analysis window.
+        hop_seconds (float): Seconds of new samples between two windows.
+        feature (callable): Function taking (window, sampling_rate).
+        latencies (list): Receives the latency, in seconds, from the drain that completed each hop to the feature
+            result, including the time spent waiting for the shared event loop.
+        stop_time (float): time.perf_counter() value at which to stop.
+    """
+    window_samples = int(window_seconds * board.sampling_rate)
+    hop_samples = int(hop_seconds * board.sampling_rate)
+    hop_index = board.latest_sample_index + hop_samples
+    while board.background and time.perf_counter() < stop_time:
+        await board.wait_for_samples_async(hop_index - 1)
+        drained = drain_clock.time_reached(hop_index)
+        if board.latest_sample_index >= window_samples:
+            feature(board.get_current_board_data(window_samples, channels=board.eeg_channels), board.sampling_rate)
+            latencies.append(time.perf_counter() - drained)
+        hop_index += hop_samples
+
+
+def run_load(num_boards, duration, window_seconds=4.0, hop_seconds=0.25, feature=beta_power_feature):
+    """
+    Streams num_boards synthetic boards for duration seconds while running the feature path on each of them.
+
+    Args:
+        num_boards (int): Number of concurrent SYNTHETIC_BOARD instances.
+        duration (float): Seconds of streaming (excluding warm-up).
+        window_seconds (float): Length of each analysis window, at least FEATURE_N_FFT samples. Default is 4.0.
+        hop_seconds (float): Seconds between two windows, which is also the deadline for each window. Default is 0.25.
+        feature (callable): Feature function taking (window, sampling_rate). Default is beta_power_feature.
+
+    Returns:
+        dict: 'boards', 'cpu_percent' (of one core), 'rss_mb', 'samples_per_second', 'windows', 'latency_p50_ms',
+            'latency_p99_ms', 'latency_max_ms' and 'missed_deadlines' (windows whose latency exceeded hop_seconds).
+
+    Raises:
+        ValueError: If the analysis window of beta_power_feature holds fewer than FEATURE_N_FFT samples.
+    """
+    window_samples = int(window_seconds * BoardShim.get_sampling_rate(BoardIds.SYNTHETIC_BOARD.value))
+    if feature is beta_power_feature and window_samples < FEATURE_N_FFT:
+        raise ValueError(f"A {window_seconds} s window holds {window_samples} samples, fewer than the "
+                         f"{FEATURE_N_FFT}-point FFT of the feature path.")
+    boards = [BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, serial_port='', name=f"Synthetic {i}", channels='eeg') for i in range(num_boards)]
+    drain_clocks = [DrainClock(board) for board in boards]
+    for board, drain_clock in zip(boards, drain_clocks):
+        board.setup(background=True, history_seconds=max(10, 2 * window_seconds), buffer_seconds=5)
+        board.add_data_callback(drain_clock)
+    try:
+        # Warm up until every board holds a full window
+        for board in boards:
+            while board.latest_sample_index < window_seconds * board.sampling_rate:
+                board.wait_for_samples(timeout=1)
+
+        latencies = [[] for _ in boards]
+        start_samples = sum(board.latest_sample_index for board in boards)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+
+        async def main():
+            stop_time = time.perf_counter() + duration
+            await asyncio.gather(*(drive_board(board, drain_clock, window_seconds, hop_seconds, feature, board_latencies, stop_time)
+                                   for board, drain_clock, board_latencies in zip(boards, drain_clocks, latencies)))
+        asyncio.run(main())
+
+        wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+        samples = sum(board.latest_sample_index for board in boards) - start_samples
+        all_latencies = np.concatenate([np.asarray(board_latencies) for board_latencies in latencies]) if any(latencies) else np.zeros(1)
+        return {
+            'boards': num_boards,
+            'cpu_percent': 100 * cpu / wall,
+            'rss_mb': current_rss_bytes() / 2**20,
+            'samples_per_second': samples / wall,
+            'windows': sum(len(board_latencies) for board_latencies in latencies),
+            'latency_p50_ms': 1000 * np.percentile(all_latencies, 50),
+            'latency_p99_ms': 1000 * np.percentile(all_latencies, 99),
+            'latency_max_ms': 1000 * all_latencies.max(),
+            'missed_deadlines': int(np.sum(all_latencies > hop_seconds)),
+        }
+    finally:
+        for board in boards:
+            board.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling test: stream N synthetic boards through the acquisition and feature path.")
+    parser.add_argument('--boards', type=int, nargs='+', default=[1, 2, 4, 8], help="Numbers of concurrent boards to test.")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds of streaming per test.")
+    parser.add_argument('--window', type=float, default=4.0, help=f"Analysis window in seconds (the Welch path needs at least {FEATURE_N_FFT} samples).")
+    parser.add_argument('--hop', type=float, default=0.25, help="Seconds between windows, also the per-window deadline.")
+    args = parser.parse_args()
+
+    BoardShim.disable_board_logger()
+
+    results = [run_load(num_boards, args.duration, args.window, args.hop) for num_boards in args.boards]
+
+    print(f"\n{'boards':>6} {'CPU %':>7} {'RSS MB':>8} {'samples/s':>10} {'windows':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'missed':>7}")
+    for r in results:
+        print(f"{r['boards']:>6} {r['cpu_percent']:>7.1f} {r['rss_mb']:>8.1f} {r['samples_per_second']:>10.0f} {r['windows']:>8} "
+              f"{r['latency_p50_ms']:>7.2f} {r['latency_p99_ms']:>7.2f} {r['latency_max_ms']:>7.2f} {r['missed_deadlines']:>7}")
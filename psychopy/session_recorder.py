@@ -0,0 +1,238 @@
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from brainflow.board_shim import BoardShim
+
+from brainflow_stream import SampleConverter
+
+
+HEADER_BYTES = 128  # Fixed .npy header size so the shape can be rewritten in place while recording
+
+
+def _write_npy_header(f, dtype, num_rows, num_samples):
+    """
+    Writes a version 1.0 .npy header of exactly HEADER_BYTES bytes at the start of the file.
+
+    The array is stored in Fortran order with shape (num_rows, num_samples), so each sample (column) is contiguous
+    and appending samples only appends bytes to the end of the file.
+
+    Args:
+        f (file): The file, opened in binary read/write mode.
+        dtype (numpy.dtype): Data type of the samples.
+        num_rows (int): Number of rows (channels) per sample.
+        num_samples (int): Number of samples recorded so far.
+    """
+    header = "{'descr': %r, 'fortran_order': True, 'shape': (%d, %d), }" % (np.lib.format.dtype_to_descr(np.dtype(dtype)), num_rows, num_samples)
+    header = header.ljust(HEADER_BYTES - 10 - 1) + '\n'
+    f.seek(0)
+    f.write(np.lib.format.magic(1, 0) + struct.pack('<H', len(header)) + header.encode('latin1'))
+    f.flush()
+
+
+def load_session(path, mmap_mode='r'):
+    """
+    Opens a session written by SessionRecorder. Safe to call while the session is still being recorded, but on Windows
+    a memory-mapped session keeps the recorder from trimming the file when it stops (see SessionRecorder.close()).
+
+    Args:
+        path (str): Path of the .npy file.
+        mmap_mode (str, optional): Memory-map mode passed to numpy.load. Default is 'r'; None loads the data into memory.
+
+    Returns:
+        tuple: The (rows x samples) data array and the metadata dictionary from the sidecar file (empty if missing).
+    """
+    data = np.load(path, mmap_mode=mmap_mode)
+    try:
+        with open(SessionRecorder.sidecar_path(path)) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        metadata = {}
+    return data, metadata
+
+
+class SessionRecorder:
+    """
+    Streams raw board data to a memory-mapped .npy file while a BrainFlowBoardSetup session is running.
+
+    Chunks drained by the background acquisition thread are appended to a preallocated file that grows in steps,
+    so long sessions use constant RAM. The .npy header always reflects the number of samples written, so the
+    file can be opened with numpy.load(path, mmap_mode='r') (or load_session) by other processes while recording.
+    A JSON sidecar next to the file stores the board ID, sampling rate and channel map.
+
+    Attributes:
+        path (str): Path of the .npy file.
+        board_setup (BrainFlowBoardSetup): The board being recorded (None if chunks are appended manually).
+        num_samples (int): Number of samples recorded so far.
+        capacity (int): Number of samples the file can hold before it has to grow.
+        recording (bool): Flag indicating if the recorder is attached to the board's acquisition thread.
+    """
+
+    def __init__(self, path, board_setup=None, initial_seconds=600, dtype=None, metadata=None):
+        """
+        Initializes the recorder. The file is created when the first chunk arrives.
+
+        Args:
+            path (str): Path of the .npy file to write.
+            board_setup (BrainFlowBoardSetup, optional): Board whose drained chunks are recorded once start() is called.
+            initial_seconds (float, optional): Seconds of data the file is preallocated for (it doubles when full). Default is 600.
+            dtype (numpy.dtype, optional): Data type stored on disk. Defaults to the board's dtype (float64 without a board).
+            metadata (dict, optional): Extra entries to store in the sidecar file.
+        """
+        self.path = path
+        self.board_setup = board_setup
+        if dtype is None:
+            dtype = board_setup.dtype if board_setup is not None else np.float64
+        self.dtype = np.dtype(dtype)
+        # Board chunks are converted like the board's own storage, so a float32 file gets relative timestamps
+        self._converter = SampleConverter(board_setup, self.dtype) if board_setup is not None else None
+        self.sampling_rate = board_setup.sampling_rate if board_setup is not None else None
+        self.initial_capacity = max(1, int(initial_seconds * (self.sampling_rate or 250)))
+        self.metadata = dict(metadata or {})
+
+        self.num_rows = None
+        self.num_samples = 0
+        self.capacity = 0
+        self.recording = False
+        self._file = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sidecar_path(path):
+        """
+        Returns the path of the JSON sidecar file stored next to the given .npy file.
+        """
+        return os.path.splitext(path)[0] + '.json'
+
+    def start(self):
+        """
+        Starts recording every chunk drained by the board's background acquisition thread.
+        """
+        if self.board_setup is None:
+            print("No board to record from, append chunks manually with append().")
+            return
+        self.board_setup.add_data_callback(self.append)
+        self.recording = True
+        print(f"[{self.board_setup.name}] Recording to {self.path}.")
+
+    def stop(self):
+        """
+        Stops recording, trims the file to the recorded samples and finalizes the sidecar file.
+        """
+        if self.board_setup is not None:
+            self.board_setup.remove_data_callback(self.append)
+        self.recording = False
+        self.close()
+
+    def append(self, chunk):
+        """
+        Appends a (rows x samples) chunk to the file, growing it if needed.
+
+        Args:
+            chunk (numpy.ndarray): The samples to append.
+        """
+        if self._converter is not None:
+            chunk = self._converter.convert(chunk)
+        with self._lock:
+            if self._file is None:
+                self._open(chunk.shape[0])
+            elif chunk.shape[0] != self.num_rows:
+                raise ValueError(f"Expected chunks with {self.num_rows} rows, got {chunk.shape[0]}.")
+
+            num_new = chunk.shape[1]
+            if self.num_samples + num_new > self.capacity:
+                self._grow(max(2 * self.capacity, self.num_samples + num_new))
+            self._data[:, self.num_samples:self.num_samples + num_new] = chunk
+            self.num_samples += num_new
+            # Publish the new shape only after the samples are in place, so concurrent readers never see unwritten data
+            _write_npy_header(self._file, self.dtype, self.num_rows, self.num_samples)
+
+    def flush(self):
+        """
+        Flushes recorded samples to disk.
+        """
+        with self._lock:
+            if self._data is not None:
+                self._data.flush()
+
+    def close(self):
+        """
+        Flushes the data, trims the file to the recorded samples and writes the final sidecar file.
+
+        On Windows the file cannot be trimmed while another process has it memory-mapped (e.g. through load_session):
+        the preallocated tail is then kept, and the .npy header still only covers the recorded samples.
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self._data.flush()
+            self._data = None
+            try:
+                self._file.truncate(HEADER_BYTES + self.num_samples * self.num_rows * self.dtype.itemsize)
+            except OSError as e:
+                print(f"Could not trim {self.path}, it is probably open in another process: {e}")
+            self._file.close()
+            self._file = None
+            self.capacity = self.num_samples
+            self._write_sidecar(finished=True)
+
+    def _open(self, num_rows):
+        """
+        Creates the file, preallocated for initial_capacity samples, and the sidecar file.
+        """
+        self.num_rows = num_rows
+        self._file = open(self.path, 'w+b')
+        _write_npy_header(self._file, self.dtype, self.num_rows, 0)
+        self._grow(self.initial_capacity)
+        self._write_sidecar(finished=False)
+
+    def _grow(self, capacity):
+        """
+        Extends the file to hold capacity samples and remaps it.
+        """
+        if self._data is not None:
+            self._data.flush()
+            # Release the mapping first: Windows cannot resize a file that has a mapped view open
+            self._data = None
+        self._file.truncate(HEADER_BYTES + capacity * self.num_rows * self.dtype.itemsize)
+        self._data = np.memmap(self._file, dtype=self.dtype, mode='r+', offset=HEADER_BYTES, shape=(self.num_rows, capacity), order='F')
+        self.capacity = capacity
+
+    def _write_sidecar(self, finished):
+        """
+        Writes the JSON sidecar with the board ID, sampling rate and channel map.
+        """
+        metadata = {
+            'num_rows': self.num_rows,
+            'dtype': self.dtype.str,
+            'sampling_rate': self.sampling_rate,
+            'start_time': self.metadata.get('start_time', time.time()),
+            'finished': finished,
+            'num_samples': self.num_samples,
+        }
+        if self.board_setup is not None:
+            board_to_use = self.board_setup.master_board if self.board_setup.master_board is not None else self.board_setup.board_id
+            metadata['board_id'] = self.board_setup.board_id
+            metadata['master_board'] = self.board_setup.master_board
+            metadata['board_name'] = self.board_setup.name
+            metadata['channel_map'] = BoardShim.get_board_descr(board_to_use)
+            # Rows of the board data stored in the file (every row unless the board declared a channel selection)
+            metadata['channel_rows'] = self.board_setup.channel_rows or list(range(self.num_rows))
+            metadata['channel_names'] = self.board_setup.channel_names
+            # Set when the file stores float32 samples: the timestamp row holds seconds since this time
+            metadata['timestamp_origin'] = self._converter.timestamp_origin
+        self.metadata.update(metadata)
+        with open(self.sidecar_path(self.path), 'w') as f:
+            json.dump(self.metadata, f, indent=2)
+
+    def __del__(self):
+        """
+        Makes sure the file is trimmed and closed when the recorder is garbage collected.
+        """
+        if self._file is not None:
+            self.close()
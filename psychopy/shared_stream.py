@@ -0,0 +1,272 @@
+import os
+import time
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from brainflow_stream import RingBuffer, SampleConverter
+
+
+# Layout of the int64 header at the start of the shared memory block, followed by the (rows x capacity) sample array
+HEADER_FIELDS = ('version', 'num_rows', 'capacity', 'board_id', 'sampling_rate', 'committed', 'pending', 'dtype_code')
+HEADER_BYTES = 64
+VERSION = 1
+DTYPE_CODES = {0: np.float64, 1: np.float32}
+
+# Names of the blocks created by publishers of this process: the resource tracker entry of such a block belongs to its publisher
+_published_names = set()
+
+
+class SharedRingBuffer(RingBuffer):
+    """
+    A RingBuffer whose storage and write counter live in a multiprocessing.shared_memory block.
+
+    The writer bumps the 'pending' counter before copying a chunk and the 'committed' counter (total_written)
+    after, so readers in other processes can detect windows that were overwritten while they were reading them.
+    """
+
+    def __init__(self, shm):
+        """
+        Wraps an initialized shared memory block (see SharedMemoryPublisher).
+
+        Args:
+            shm (multiprocessing.shared_memory.SharedMemory): The shared memory block.
+        """
+        self.shm = shm
+        self.header = np.ndarray((len(HEADER_FIELDS),), dtype=np.int64, buffer=shm.buf)
+        num_rows, capacity = int(self._field('num_rows')), int(self._field('capacity'))
+        dtype = DTYPE_CODES[int(self._field('dtype_code'))]
+        self.data = np.ndarray((num_rows, capacity), dtype=dtype, buffer=shm.buf, offset=HEADER_BYTES)
+        self.capacity = capacity
+
+    def _field(self, name):
+        return self.header[HEADER_FIELDS.index(name)]
+
+    @property
+    def total_written(self):
+        return int(self._field('committed'))
+
+    @total_written.setter
+    def total_written(self, value):
+        self.header[HEADER_FIELDS.index('committed')] = value
+
+    @property
+    def pending(self):
+        """
+        int: Index one past the newest sample being written (equal to total_written when no write is in progress).
+        """
+        return int(self._field('pending'))
+
+    def write(self, chunk):
+        """
+        Copies a chunk into the shared buffer, announcing it through the pending counter first.
+        """
+        self.header[HEADER_FIELDS.index('pending')] = self.total_written + chunk.shape[1]
+        super().write(chunk)
+
+    def read_consistent(self, start_index, stop_index, rows=None, copy=True, retries=10):
+        """
+        Reads samples like read(), retrying if the writer overwrote part of the window during the read.
+
+        Args:
+            start_index (int): Index of the first sample to return.
+            stop_index (int): Index one past the last sample to return.
+            rows (slice | list | int, optional): Rows to return. Defaults to all rows.
+            copy (bool): Whether to copy the window out of shared memory. A view is only valid until the writer wraps
+                around onto it. Default is True.
+            retries (int): Number of attempts before giving up. Default is 10.
+
+        Returns:
+            numpy.ndarray: The (rows x samples) window.
+
+        Raises:
+            RuntimeError: If every attempt was overwritten by the writer (the reader is too slow for the buffer size).
+        """
+        for _ in range(retries):
+            start_index = max(start_index, self.oldest_index)
+            window = self.read(start_index, stop_index, rows)
+            if copy:
+                window = np.array(window)
+            # Samples older than pending - capacity may have been overwritten while the window was being read
+            if self.pending - self.capacity <= start_index:
+                return window
+        raise RuntimeError("Shared stream window was overwritten while reading it, use a larger history or read more often.")
+
+
+class SharedMemoryPublisher:
+    """
+    Mirrors the stream drained by a BrainFlowBoardSetup into a multiprocessing.shared_memory ring buffer,
+    so other processes (the PsychoPy game, live plots, feature extraction) can read the same board.
+
+    Other processes attach by name with SharedMemoryReader.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board whose background acquisition thread feeds the publisher.
+        name (str): Name of the shared memory block.
+        buffer (SharedRingBuffer): The shared ring buffer (None until start() is called).
+        publishing (bool): Flag indicating if the publisher is attached to the board's acquisition thread.
+        converter (SampleConverter): Converts the board's chunks to dtype (float32 timestamps are relative to its timestamp_origin).
+    """
+
+    def __init__(self, board_setup, name=None, history_seconds=10, dtype=None):
+        """
+        Initializes the publisher. The shared memory block is created by start().
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to publish. It must be set up in background mode before start().
+            name (str, optional): Name of the shared memory block. Defaults to a unique name based on the board name.
+            history_seconds (float, optional): Seconds of history kept in shared memory. Default is 10.
+            dtype (numpy.dtype, optional): Data type of the shared samples (float64 or float32). Defaults to the board's dtype.
+        """
+        self.board_setup = board_setup
+        self.name = name or f"brainflow_{board_setup.name.replace(' ', '_').lower()}_{uuid.uuid4().hex[:8]}"
+        self.history_seconds = history_seconds
+        self.dtype = np.dtype(dtype if dtype is not None else board_setup.dtype)
+        self.converter = SampleConverter(board_setup, self.dtype)
+        self.buffer = None
+        self.publishing = False
+        self._shm = None
+
+    def start(self):
+        """
+        Creates the shared memory block and starts mirroring every drained chunk into it.
+        """
+        num_rows = self.board_setup.get_num_channels()
+        capacity = int(self.history_seconds * (self.board_setup.sampling_rate or 250))
+        dtype_code = {np.dtype(dtype): code for code, dtype in DTYPE_CODES.items()}[self.dtype]
+
+        self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=HEADER_BYTES + num_rows * capacity * self.dtype.itemsize)
+        header = np.ndarray((len(HEADER_FIELDS),), dtype=np.int64, buffer=self._shm.buf)
+        header[:] = (VERSION, num_rows, capacity, self.board_setup.board_id, self.board_setup.sampling_rate or 0, 0, 0, dtype_code)
+        del header
+        self.buffer = SharedRingBuffer(self._shm)
+        _published_names.add(self.name)
+
+        self.board_setup.add_data_callback(self.publish)
+        self.publishing = True
+        print(f"[{self.board_setup.name}] Publishing stream to shared memory '{self.name}'.")
+
+    def publish(self, chunk):
+        """
+        Writes a (rows x samples) chunk into shared memory.
+
+        Args:
+            chunk (numpy.ndarray): The samples to publish.
+        """
+        self.buffer.write(self.converter.convert(chunk))
+
+    def stop(self):
+        """
+        Stops publishing and destroys the shared memory block. Attached readers keep their mapping until they close it.
+        """
+        self.board_setup.remove_data_callback(self.publish)
+        self.publishing = False
+        if self._shm is not None:
+            self.buffer = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            _published_names.discard(self.name)
+
+
+class SharedMemoryReader:
+    """
+    Reads a stream published by SharedMemoryPublisher from any process on the same machine.
+
+    Attributes:
+        name (str): Name of the shared memory block.
+        num_rows (int): Number of rows per sample.
+        sampling_rate (int): Sampling rate of the published board.
+        board_id (int): BrainFlow board ID of the published board.
+        buffer (SharedRingBuffer): The shared ring buffer.
+    """
+
+    def __init__(self, name):
+        """
+        Attaches to a published stream.
+
+        Args:
+            name (str): Name of the shared memory block (SharedMemoryPublisher.name).
+        """
+        self.name = name
+        self._shm = shared_memory.SharedMemory(name=name)
+        # Only the publisher owns the block: stop this process's resource tracker from unlinking it on exit. SharedMemory
+        # only registers blocks on POSIX (on Windows the tracker cannot even start), and a block published by this
+        # process keeps its publisher's registration, which the publisher removes when it unlinks the block
+        if os.name == 'posix' and name not in _published_names:
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+        self.buffer = SharedRingBuffer(self._shm)
+        if int(self.buffer._field('version')) != VERSION:
+            raise ValueError(f"Shared stream '{name}' has an unsupported layout version.")
+        self.num_rows = self.buffer.num_rows
+        self.sampling_rate = int(self.buffer._field('sampling_rate'))
+        self.board_id = int(self.buffer._field('board_id'))
+
+    @property
+    def latest_sample_index(self):
+        """
+        int: Total number of samples published (index one past the newest sample).
+        """
+        return self.buffer.total_written
+
+    def get_current_board_data(self, num_samples, channels=None, copy=True):
+        """
+        Retrieves the most recent num_samples samples.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch.
+            channels (slice | list, optional): Rows to return. Defaults to all rows.
+            copy (bool): Whether to copy the window out of shared memory. With copy=False the result is a read-only
+                view that stays valid until the publisher wraps around onto it. Default is True.
+
+        Returns:
+            numpy.ndarray: The (rows x samples) window.
+        """
+        stop_index = self.buffer.total_written
+        return self.buffer.read_consistent(stop_index - int(num_samples), stop_index, rows=channels, copy=copy)
+
+    def get_data_since(self, start_index, channels=None, copy=True):
+        """
+        Retrieves every sample published from start_index on (clipped to the history still held).
+
+        Args:
+            start_index (int): Index of the first sample to return, e.g. a previous latest_sample_index.
+            channels (slice | list, optional): Rows to return. Defaults to all rows.
+            copy (bool): Whether to copy the window out of shared memory. Default is True.
+
+        Returns:
+            numpy.ndarray: The (rows x samples) window.
+        """
+        return self.buffer.read_consistent(start_index, self.buffer.total_written, rows=channels, copy=copy)
+
+    def wait_for_samples(self, index=None, timeout=None, poll_interval=0.001):
+        """
+        Waits until samples past the given index have been published.
+
+        Args:
+            index (int, optional): Sample index to wait past. Defaults to the current latest_sample_index.
+            timeout (float, optional): Maximum number of seconds to wait. Default is None (wait forever).
+            poll_interval (float): Seconds between two checks of the shared counter. Default is 0.001.
+
+        Returns:
+            int: The latest_sample_index after waking up (unchanged if the wait timed out).
+        """
+        index = self.latest_sample_index if index is None else index
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.latest_sample_index <= index:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(poll_interval)
+        return self.latest_sample_index
+
+    def close(self):
+        """
+        Detaches from the shared memory block.
+        """
+        self.buffer = None
+        self._shm.close()
+
+    def __del__(self):
+        if self.__dict__.get('buffer') is not None:
+            self.close()
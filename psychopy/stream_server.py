@@ -0,0 +1,265 @@
+import collections
+import os
+import socket
+import struct
+import threading
+
+import numpy as np
+
+from brainflow_stream import SampleConverter
+
+
+# Wire format: every frame is a fixed-size little-endian header followed by the samples of one drained chunk,
+# channel-major (all samples of the first channel, then the second, ...):
+#   magic (4 bytes, b'BFS1'), sequence number (uint64, per client, starts at 0), index of the first sample in the
+#   stream (uint64), BrainFlow timestamp of the first sample (float64, NaN if unknown), number of channels (uint16),
+#   number of samples (uint32), dtype code (uint8, see DTYPE_CODES), 1 padding byte.
+# A client can detect chunks dropped for it by gaps in the sequence numbers, and lost samples by gaps in the sample index.
+# In float32 frames the timestamp row holds seconds since a fixed origin: the header timestamp minus the first
+# timestamp of the frame recovers it.
+FRAME_MAGIC = b'BFS1'
+FRAME_HEADER = struct.Struct('<4sQQdHIBx')
+DTYPE_CODES = {0: np.dtype('<f8'), 1: np.dtype('<f4')}
+DEFAULT_SERVER_ADDRESS = ('127.0.0.1', 57400)
+
+
+class _ClientSession:
+    """
+    The bounded frame queue and sender thread of one connected client.
+    """
+
+    def __init__(self, server, sock, address, queue_size):
+        self.server = server
+        self.sock = sock
+        self.address = address
+        self.frames = collections.deque(maxlen=queue_size)  # appending to a full queue drops the oldest frame
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._send_loop, name=f"stream client {address}", daemon=True)
+
+    def put(self, header_fields, payload):
+        with self.condition:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1
+            self.frames.append((self.sequence, header_fields, payload))
+            self.sequence += 1
+            self.condition.notify()
+
+    def _send_loop(self):
+        while True:
+            with self.condition:
+                while not self.frames and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    break
+                sequence, header_fields, payload = self.frames.popleft()
+            try:
+                self.sock.sendall(FRAME_HEADER.pack(FRAME_MAGIC, sequence, *header_fields) + payload)
+            except OSError:
+                break
+            self.sent += 1
+        self.server._remove_client(self)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class StreamServer:
+    """
+    Streams the chunks drained by a BrainFlowBoardSetup to any number of local clients over TCP or a Unix socket,
+    as framed binary messages (see FRAME_HEADER), so dashboards, recorders and classifiers can run in other processes
+    or languages without direct board access.
+
+    Every client has its own bounded queue and sender thread. The acquisition thread only appends frames to the
+    queues; when a client falls queue_size frames behind, its oldest frames are dropped, so a slow client never
+    stalls acquisition or the other clients.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board whose background acquisition thread feeds the server.
+        address (tuple | str): (host, port) of the TCP socket, or path of the Unix socket.
+        queue_size (int): Maximum number of frames queued per client.
+        dtype (numpy.dtype): Data type of the samples sent (float64 or float32).
+        serving (bool): Flag indicating if the server is attached to the board's acquisition thread.
+    """
+
+    def __init__(self, board_setup, address=DEFAULT_SERVER_ADDRESS, queue_size=64, dtype=None):
+        """
+        Initializes the server. The socket is opened by start().
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to stream. It must be set up in background mode before start().
+            address (tuple | str, optional): (host, port) to listen on with TCP, or a Unix socket path. Default is DEFAULT_SERVER_ADDRESS.
+            queue_size (int, optional): Maximum number of frames queued per client before the oldest are dropped. Default is 64.
+            dtype (numpy.dtype, optional): Data type of the samples sent (float64 or float32). Defaults to the board's dtype.
+        """
+        self.board_setup = board_setup
+        self.address = address
+        self.queue_size = queue_size
+        self.dtype = np.dtype(dtype if dtype is not None else board_setup.dtype).newbyteorder('<')
+        self.dtype_code = {dtype: code for code, dtype in DTYPE_CODES.items()}[self.dtype]
+        self._converter = SampleConverter(board_setup, self.dtype)
+        self.serving = False
+        self._sock = None
+        self._clients = []
+        self._lock = threading.Lock()
+        self._accept_thread = None
+
+    def start(self):
+        """
+        Opens the listening socket and starts streaming every drained chunk to connected clients.
+        """
+        family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        self._sock.listen()
+        self.serving = True
+        self._accept_thread = threading.Thread(target=self._accept_loop, name=f"{self.board_setup.name} stream server", daemon=True)
+        self._accept_thread.start()
+        self.board_setup.add_data_callback(self.publish)
+        print(f"[{self.board_setup.name}] Streaming to clients on {self.address}.")
+
+    def _accept_loop(self):
+        """
+        Body of the accept thread: registers every new client connection.
+        """
+        while self.serving:
+            try:
+                sock, address = self._sock.accept()
+            except OSError:
+                break
+            if sock.family == socket.AF_INET:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _ClientSession(self, sock, address or self.address, self.queue_size)
+            with self._lock:
+                self._clients.append(client)
+            client.thread.start()
+
+    def publish(self, chunk):
+        """
+        Queues a (rows x samples) chunk for every connected client. Called from the board's acquisition thread.
+
+        Args:
+            chunk (numpy.ndarray): The samples to send.
+        """
+        with self._lock:
+            clients = list(self._clients)
+        if not clients:
+            return
+        num_samples = chunk.shape[1]
+        # Data callbacks run in the acquisition thread right after the chunk was written, so the newest buffered
+        # samples are exactly this chunk
+        start_index = self.board_setup.latest_sample_index - num_samples
+        window = self.board_setup.get_current_window(num_samples, channels=[])
+        timestamp = float(window[1][0]) if window is not None and window[1].size else float('nan')
+        header_fields = (start_index, timestamp, chunk.shape[0], num_samples, self.dtype_code)
+        payload = np.ascontiguousarray(self._converter.convert(chunk), dtype=self.dtype).tobytes()
+        for client in clients:
+            client.put(header_fields, payload)
+
+    def _remove_client(self, client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+        client.close()
+
+    def get_client_stats(self):
+        """
+        Reports the state of every connected client.
+
+        Returns:
+            list: One dictionary per client with its 'address', and the number of frames 'sent', 'dropped' and 'queued'.
+        """
+        with self._lock:
+            clients = list(self._clients)
+        return [{'address': client.address, 'sent': client.sent, 'dropped': client.dropped, 'queued': len(client.frames)} for client in clients]
+
+    def stop(self):
+        """
+        Stops streaming, disconnects every client and closes the listening socket.
+        """
+        self.board_setup.remove_data_callback(self.publish)
+        self.serving = False
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+
+
+class StreamClient:
+    """
+    Receives the frames sent by a StreamServer. Clients in other languages only need to implement FRAME_HEADER.
+    """
+
+    def __init__(self, address=DEFAULT_SERVER_ADDRESS, timeout=None):
+        """
+        Connects to a server.
+
+        Args:
+            address (tuple | str, optional): Address of the server. Default is DEFAULT_SERVER_ADDRESS.
+            timeout (float, optional): Socket timeout in seconds. Default is None (block).
+        """
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address)
+
+    def _read_exactly(self, num_bytes):
+        data = bytearray()
+        while len(data) < num_bytes:
+            part = self.sock.recv(num_bytes - len(data))
+            if not part:
+                raise ConnectionError("Stream server closed the connection.")
+            data += part
+        return bytes(data)
+
+    def read_frame(self):
+        """
+        Reads the next frame.
+
+        Returns:
+            tuple: The header dictionary ('sequence', 'sample_index', 'timestamp', 'num_channels', 'num_samples',
+                'dtype') and the (channels x samples) array.
+
+        Raises:
+            ConnectionError: If the server closed the connection.
+            ValueError: If the stream is not a StreamServer stream.
+        """
+        magic, sequence, sample_index, timestamp, num_channels, num_samples, dtype_code = FRAME_HEADER.unpack(self._read_exactly(FRAME_HEADER.size))
+        if magic != FRAME_MAGIC:
+            raise ValueError("Not a BrainFlow stream frame.")
+        dtype = DTYPE_CODES[dtype_code]
+        payload = self._read_exactly(num_channels * num_samples * dtype.itemsize)
+        header = {'sequence': sequence, 'sample_index': sample_index, 'timestamp': timestamp,
+                  'num_channels': num_channels, 'num_samples': num_samples, 'dtype': dtype}
+        return header, np.frombuffer(payload, dtype=dtype).reshape(num_channels, num_samples)
+
+    def __iter__(self):
+        while True:
+            try:
+                yield self.read_frame()
+            except ConnectionError:
+                return
+
+    def close(self):
+        self.sock.close()